@@ -16,7 +16,19 @@ config: Config = {
         'INTEGRARK_DEFINITIONS_DIRECTORY', 'schema/definitions'),
     'integrations_directory': os.environ.get(
         'INTEGRARK_INTEGRATIONS_DIRECTORY', 'schema/integrations'),
+    'instrumentation': bool(os.environ.get(
+        'INTEGRARK_INSTRUMENTATION', '')),
+    'cache': {
+        'ttl': int(os.environ.get('INTEGRARK_CACHE_TTL', 300)),
+        'max_entries': int(os.environ.get(
+            'INTEGRARK_CACHE_MAX_ENTRIES', 10000)),
+        'memcached': os.environ.get('INTEGRARK_CACHE_MEMCACHED', ''),
+        # Dotted path of the function rebuilding entities from memcached
+        # values, which are otherwise returned as plain dicts.
+        'loads': os.environ.get('INTEGRARK_CACHE_LOADS', '')
+    },
     'secrets': {
-        'jwt': os.environ.get('INTEGRARK_TOKENS_SECRET', '')
+        'jwt': os.environ.get('INTEGRARK_TOKENS_SECRET', ''),
+        'jwks': os.environ.get('INTEGRARK_TOKENS_JWKS', '')
     }
 }
@@ -1 +1,2 @@
 from .jwt_supplier import JwtSupplier
+from .key_set import KeySet
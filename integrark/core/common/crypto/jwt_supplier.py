@@ -1,18 +1,84 @@
 import json
-from jwt import decode, InvalidTokenError
+from hashlib import sha256
+from time import time
+from typing import Dict, Callable, Any
+from jwt import decode, get_unverified_header, InvalidTokenError
+from ..dataloader.cache import LruCache
+from .key_set import KeySet
 
 
 class JwtSupplier:
-    def __init__(self, secret: str) -> None:
+    """Token decoder caching verified payloads by token digest
+
+    Entries are only served while the token is within its 'nbf' and
+    'exp' claims. Values derived from a payload with 'transform' are
+    cached with it, so warm requests skip the crypto. Callers always
+    receive their own copies, the cached values are never shared.
+    Tokens whose header 'kid' names a key of 'key_set' are verified
+    with that key, otherwise they are verified with the HS256 secret,
+    which is mandatory when a key set is configured.
+    """
+
+    def __init__(self, secret: str, max_entries: int = 1024,
+                 clock: Callable[[], float] = time,
+                 key_set: KeySet = None) -> None:
         self.secret = secret
+        self.cache = LruCache(max_entries)
+        self.clock = clock
+        self.key_set = key_set
 
     def encode(self):
         return
 
-    def decode(self, token: str, secret=None, verify=True):
-        secret = secret or self.secret
-        try:
-            return decode(
-                token, secret, verify=verify, algorithms=['HS256'])
-        except InvalidTokenError:
+    def decode(self, token: str, secret=None, verify=True,
+               transform: Callable[[Dict[str, Any]], Any] = None) -> Any:
+        if not token:
             return None
+
+        secret = secret or self.secret
+        version = self.key_set.version if self.key_set else 0
+        key = (sha256(token.encode()).digest(), secret, verify, version)
+        entry = self.cache.get(key)
+        if entry and not self._valid(entry['payload']):
+            self.cache.pop(key)
+            entry = None
+
+        if not entry:
+            try:
+                payload = self._verify(token, secret, verify)
+            except InvalidTokenError:
+                return None
+            entry = {'payload': payload, 'derived': {}}
+            self.cache.set(key, entry)
+
+        if transform is None:
+            return copy_json(entry['payload'])
+        derived = entry['derived']
+        if transform not in derived:
+            derived[transform] = transform(copy_json(entry['payload']))
+        return copy_json(derived[transform])
+
+    def _verify(self, token: str, secret: str,
+                verify: bool) -> Dict[str, Any]:
+        kid = self.key_set and get_unverified_header(token).get('kid')
+        key = kid and self.key_set.get(kid)  # type: ignore
+        if key:
+            return decode(token, key.key, verify=verify,
+                          algorithms=[key.algorithm])
+        if self.key_set and not secret:
+            raise InvalidTokenError('No HS256 secret configured')
+        return decode(token, secret, verify=verify, algorithms=['HS256'])
+
+    def _valid(self, payload: Dict[str, Any]) -> bool:
+        now = self.clock()
+        return (now < payload.get('exp', now + 1) and
+                now >= payload.get('nbf', now))
+
+
+def copy_json(value: Any) -> Any:
+    """Copy the dicts and lists of a decoded token, sharing its scalars"""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
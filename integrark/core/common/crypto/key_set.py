@@ -0,0 +1,69 @@
+import json
+import logging
+from os import stat
+from time import monotonic
+from typing import Dict, Tuple, Optional, NamedTuple, Callable, Any
+from jwt import PyJWK
+
+
+ALGORITHMS = {
+    ('RSA', None): 'RS256',
+    ('EC', 'P-256'): 'ES256',
+    ('EC', 'P-384'): 'ES384',
+    ('EC', 'P-521'): 'ES512'
+}
+
+
+class Key(NamedTuple):
+    key: Any
+    algorithm: str
+
+
+class KeySet:
+    """JSON Web Key Set file parsed into key objects indexed by 'kid'
+
+    The file is checked for changes at most every 'interval' seconds
+    and its keys are swapped in at once only when it parses correctly.
+    """
+
+    def __init__(self, path: str, interval: float = 5,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.path = path
+        self.interval = interval
+        self.clock = clock
+        self.keys: Dict[str, Key] = {}
+        self.version = 0
+        self.signature: Tuple = ()
+        self.checked = clock()
+        self.load()
+
+    def get(self, kid: str) -> Optional[Key]:
+        if self.clock() - self.checked >= self.interval:
+            self.refresh()
+        return self.keys.get(kid)
+
+    def refresh(self) -> None:
+        self.checked = self.clock()
+        try:
+            if self._signature() != self.signature:
+                self.load()
+        except Exception:
+            logging.exception(f'Key set <{self.path}> reload failed')
+
+    def load(self) -> None:
+        signature = self._signature()
+        with open(self.path) as f:
+            data = json.load(f)
+
+        keys = {}
+        for item in data.get('keys', []):
+            algorithm = item.get('alg') or ALGORITHMS[
+                (item.get('kty'), item.get('crv'))]
+            keys[item['kid']] = Key(PyJWK(item, algorithm).key, algorithm)
+
+        self.keys, self.signature = keys, signature
+        self.version += 1
+
+    def _signature(self) -> Tuple:
+        result = stat(self.path)
+        return (result.st_ino, result.st_size, result.st_mtime_ns)
@@ -1,2 +1,11 @@
+from .cache import (
+    MemoryCache, NullCache, LruCache, TtlCache, WeightedCache)
+from .shared_cache import SharedCache
+from .memcached_cache import MemcachedCache
+from .instrumentation import Instrumentation
+from .executor import FetchExecutor
+from .scheduler import TickScheduler, WindowScheduler, AdaptiveScheduler
+from .pagination import Page
+from .compact import ColumnStore, Row, GroupView
 from .dataloader import DataLoader, StandardDataLoader
 from .joiner import Joiner
@@ -0,0 +1,180 @@
+import sys
+from asyncio import isfuture
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Iterator, Callable, Hashable, Any
+
+
+class MemoryCache:
+    """Unbounded cache kept for the whole loader lifetime"""
+
+    def __init__(self) -> None:
+        self.data: Dict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.data.get(key, default)
+        if key in self.data:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.data[key] = value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self.data.pop(key, default)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self)}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self.data))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def _evict(self, key: Hashable) -> Any:
+        self.evictions += 1
+        return self.data.pop(key)
+
+
+class NullCache(MemoryCache):
+    """Cache that never keeps anything"""
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+
+class LruCache(MemoryCache):
+    """Cache keeping at most 'max_entries' recently used items"""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self.data:
+            self.data.move_to_end(key)  # type: ignore
+        return super().get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        super().set(key, value)
+        self.data.move_to_end(key)  # type: ignore
+        while len(self.data) > self.max_entries:
+            self._evict(next(iter(self.data)))
+
+
+class TtlCache(MemoryCache):
+    """Cache whose items expire 'ttl' seconds after being set
+
+    With 'max_entries', the least recently used items are evicted first.
+    """
+
+    def __init__(self, ttl: float = 60,
+                 clock: Callable[[], float] = monotonic,
+                 max_entries: int = 0) -> None:
+        super().__init__()
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self.expirations: Dict[Hashable, float] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        expiration = self.expirations.get(key)
+        if expiration is not None and expiration <= self.clock():
+            self._evict(key)
+        elif expiration is not None:
+            self.data.move_to_end(key)  # type: ignore
+        return super().get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._purge()
+        self.pop(key)
+        super().set(key, value)
+        self.expirations[key] = self.clock() + self.ttl
+        while self.max_entries and len(self.data) > self.max_entries:
+            self._evict(next(iter(self.data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        self.expirations.pop(key, None)
+        return super().pop(key, default)
+
+    def clear(self) -> None:
+        self.expirations.clear()
+        super().clear()
+
+    def _evict(self, key: Hashable) -> Any:
+        self.expirations.pop(key, None)
+        return super()._evict(key)
+
+    def _purge(self) -> None:
+        now = self.clock()
+        for key in list(self.expirations):
+            if self.expirations[key] > now:
+                break
+            self._evict(key)
+
+
+class WeightedCache(LruCache):
+    """Cache evicting least recently used items above 'max_weight'
+
+    Pending futures weigh one unit until they are resolved, when
+    their result is weighed with the 'weigh' function instead.
+    """
+
+    def __init__(self, max_weight: int = 2 ** 24,
+                 weigh: Callable[[Any], int] = sys.getsizeof) -> None:
+        super().__init__(max_entries=sys.maxsize)
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weights: Dict[Hashable, int] = {}
+        self.weight = 0
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.pop(key)
+        super().set(key, value)
+        self._reweigh(key, value)
+        if isfuture(value) and not value.done():
+            value.add_done_callback(
+                lambda future: self._reweigh(key, future))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        self.weight -= self.weights.pop(key, 0)
+        return super().pop(key, default)
+
+    def clear(self) -> None:
+        self.weights.clear()
+        self.weight = 0
+        super().clear()
+
+    def _evict(self, key: Hashable) -> Any:
+        self.weight -= self.weights.pop(key, 0)
+        return super()._evict(key)
+
+    def _reweigh(self, key: Hashable, value: Any) -> None:
+        if self.data.get(key) is not value:
+            return
+
+        weight = 1
+        if not isfuture(value):
+            weight = self.weigh(value)
+        elif value.done() and not value.cancelled() and (
+                value.exception() is None):
+            weight = self.weigh(value.result())
+
+        self.weight += weight - self.weights.get(key, 0)
+        self.weights[key] = weight
+        while self.weight > self.max_weight and len(self.data) > 1:
+            self._evict(next(iter(self.data)))
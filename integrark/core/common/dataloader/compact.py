@@ -0,0 +1,113 @@
+from array import array
+from types import SimpleNamespace
+from typing import (
+    List, Dict, Sequence, Iterable, Callable, Any, overload)
+from .keys import Key
+
+
+class ColumnStore:
+    """Join results kept as one list per field instead of entities"""
+
+    def __init__(self, fields: Iterable[str] = (),
+                 factory: Callable[..., Any] = SimpleNamespace) -> None:
+        self.fields = list(fields)
+        self.columns: Dict[str, List[Any]] = {
+            field: [] for field in self.fields}
+        self.factory = factory
+        self.length = 0
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            if not self.fields:
+                self.fields = list(vars(item))
+                self.columns = {field: [] for field in self.fields}
+            for field, column in self.columns.items():
+                column.append(getattr(item, field, None))
+            self.length += 1
+
+    def row(self, index: int) -> 'Row':
+        return Row(self, index)
+
+    def keys(self, key: Key) -> Sequence[Any]:
+        if not isinstance(key, tuple):
+            return self.columns.get(key, [])
+        return list(zip(*[self.columns[field] for field in key]))
+
+    def group(self, key: Key, resolve: Callable[[int], Any] = None
+              ) -> Dict[Any, 'GroupView']:
+        keys = self.keys(key)
+        order = array('L', sorted(range(self.length), key=keys.__getitem__))
+        resolve = resolve or self.row
+
+        groups: Dict[Any, GroupView] = {}
+        start = 0
+        for end in range(1, self.length + 1):
+            if end < self.length and (
+                    keys[order[end]] == keys[order[start]]):
+                continue
+            groups[keys[order[start]]] = GroupView(
+                order, start, end, resolve)
+            start = end
+
+        return groups
+
+    def __len__(self) -> int:
+        return self.length
+
+
+class Row:
+    """Lazy record reading its attributes from a column store"""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: ColumnStore, index: int) -> None:
+        self.store = store
+        self.index = index
+
+    def __getattr__(self, name: str) -> Any:
+        column = self.store.columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        return column[self.index]
+
+    def materialize(self) -> Any:
+        return self.store.factory(**{
+            field: column[self.index]
+            for field, column in self.store.columns.items()})
+
+
+class GroupView(Sequence):
+    """Read-only sequence over a sorted slice of a column store"""
+
+    __slots__ = ('order', 'start', 'end', 'resolve')
+
+    def __init__(self, order: Sequence[int], start: int, end: int,
+                 resolve: Callable[[int], Any]) -> None:
+        self.order = order
+        self.start = start
+        self.end = end
+        self.resolve = resolve
+
+    @overload
+    def __getitem__(self, position: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[Any]: ...
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(
+                *position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.resolve(self.order[self.start + position])
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
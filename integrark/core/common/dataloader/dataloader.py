@@ -1,51 +1,199 @@
 from abc import ABC, abstractmethod
-from asyncio import Future, get_event_loop, ensure_future, gather
-from typing import Union, List, Dict, Callable, Any, NamedTuple, Awaitable
+from asyncio import (
+    Future, Handle, Semaphore, CancelledError,
+    get_event_loop, ensure_future, gather, current_task)
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction
+from typing import (
+    Union, List, Dict, Mapping, Callable, Any, NamedTuple, Awaitable,
+    Optional, Iterable, FrozenSet)
+from .cache import MemoryCache
+from .executor import FetchExecutor
+from .instrumentation import Instrumentation
+from .scheduler import TickScheduler
+from .shared_cache import SharedCache
 
 
-FetchFunction = Callable[[List[str]], Awaitable[List[Any]]]
+FetchResult = Union[List[Any], Mapping[str, Any]]
+
+FetchFunction = Callable[[List[str]], Awaitable[FetchResult]]
+
+Projection = Optional[FrozenSet[str]]
 
 
 class DataLoader(ABC):
-    def __init__(self, context: Dict[str, Any] = None) -> None:
+    def __init__(self, context: Dict[str, Any] = None, *,
+                 max_batch_size: int = 0,
+                 max_concurrency: int = 0,
+                 cache: MemoryCache = None,
+                 scheduler: TickScheduler = None,
+                 name: str = '',
+                 shared_cache: SharedCache = None,
+                 default: Any = None,
+                 strict: bool = False,
+                 label: str = '',
+                 instrumentation: Instrumentation = None) -> None:
         self.loop = get_event_loop()
         self.queue: List[Loader] = []
-        self.cache: Dict[str, Any] = {}
+        self.cache: MemoryCache = (
+            MemoryCache() if cache is None else cache)
+        self.projections: Dict[str, FrozenSet[str]] = {}
+        self.scheduler = scheduler or TickScheduler()
+        self.handle: Optional[Handle] = None
         self.context: Dict[str, Any] = context or {}
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self.shared_cache: Optional[SharedCache] = name and (
+            shared_cache or self.context.get('shared_cache')) or None
+        self.default = default
+        self.strict = strict
+        self.label = label or name or type(self).__name__
+        self.instrumentation: Optional[Instrumentation] = (
+            instrumentation or self.context.get('instrumentation'))
 
-    def load(self, id: str) -> Awaitable[Any]:
+    def load(self, id: str,
+             fields: Optional[Iterable[str]] = None) -> Awaitable[Any]:
+        projection: Projection = (
+            None if fields is None else frozenset(fields))
         cached_result = self.cache.get(id)
+        if cached_result is not None and not self._covers(id, projection):
+            cached_result = None
+            current = self.projections.get(id)
+            projection = projection and current and projection | current
+        if self.instrumentation:
+            self._record_load(self.instrumentation, cached_result)
         if cached_result is not None:
             return cached_result
 
         future = self.loop.create_future()
-        self.cache[id] = future
+        self._store(id, future, projection)
 
-        self.queue.append(Loader(id, future))
-        if len(self.queue) == 1:
+        self.queue.append(Loader(id, future, projection))
+        if len(self.queue) == self.scheduler.threshold:
+            self._flush()
+        elif len(self.queue) == 1:
             self._schedule_dispatch()
         return future
 
-    def load_many(self, ids: List[str]) -> Awaitable[List[Any]]:
-        return gather(*[self.load(id) for id in ids])
+    def load_many(self, ids: List[str],
+                  fields: Optional[Iterable[str]] = None
+                  ) -> Awaitable[List[Any]]:
+        fields = None if fields is None else frozenset(fields)
+        return gather(*[self.load(id, fields) for id in ids])
+
+    def prime(self, id: str, value: Any,
+              fields: Optional[Iterable[str]] = None) -> None:
+        projection = None if fields is None else frozenset(fields)
+        if id in self.cache and self._covers(id, projection):
+            return
+
+        future = self.loop.create_future()
+        if isinstance(value, Exception):
+            future.set_exception(value)
+        else:
+            future.set_result(value)
+        self._store(id, future, projection)
+
+    def prime_many(self, values: Dict[str, Any],
+                   fields: Optional[Iterable[str]] = None) -> None:
+        fields = None if fields is None else frozenset(fields)
+        for id, value in values.items():
+            self.prime(id, value, fields)
+
+    def clear(self, id: str) -> None:
+        self.cache.pop(id, None)
+        self.projections.pop(id, None)
+
+    def clear_all(self) -> None:
+        self.cache.clear()
+        self.projections.clear()
 
     @abstractmethod
-    async def fetch(self, ids: List[str]) -> List[Any]:
-        """Fetch method to be implemented by subclasses"""
+    async def fetch(self, ids: List[str]) -> FetchResult:
+        """Fetch method to be implemented by subclasses
 
-    def _schedule_dispatch(self):
-        self.loop.call_soon(ensure_future, self._dispatch())
+        It might return either a list of values aligned with 'ids' or
+        a mapping of ids to values, in which missing ids resolve to the
+        loader's 'default' or to a KeyError on 'strict' loaders.
 
-    async def _dispatch(self):
-        ids = [item.id for item in self.queue]
-        values = (await self.fetch(ids)) or []
-        if len(values) != len(ids):
-            return self._terminate(TypeError(
-                "Unequal number of elements returned by fetch: "
-                f"<ids>: {ids} <values>: {values}"))
+        Loaders receiving 'fields' on their loads must also accept a
+        'fields' keyword with the union of the batch's projections.
+        """
 
+    def _covers(self, id: str, projection: Projection) -> bool:
+        current = self.projections.get(id)
+        if current is None:
+            return True
+        return projection is not None and projection <= current
+
+    def _store(self, id: str, future: Future,
+               projection: Projection) -> None:
+        self.cache.set(id, future)
+        self._project(id, projection)
+
+    def _project(self, id: str, projection: Projection) -> None:
+        if projection is None:
+            self.projections.pop(id, None)
+            return
+
+        self.projections[id] = projection
+        if len(self.projections) > 2 * len(self.cache):
+            # Forget the projections of ids evicted by the cache policy
+            self.projections = {key: value for key, value in
+                                self.projections.items() if key in self.cache}
+
+    def _record_load(self, instrumentation: Instrumentation,
+                     cached_result: Optional[Future]) -> None:
+        if cached_result is None:
+            return instrumentation.record_load(self.label)
+        instrumentation.record_load(
+            self.label, cached_result.done(), not cached_result.done())
+
+    def _schedule_dispatch(self):
+        delay = self.scheduler.delay()
+        self.handle = (self.loop.call_later(delay, self._flush) if delay
+                       else self.loop.call_soon(self._flush))
+
+    def _flush(self):
+        if self.handle:
+            self.handle.cancel()
+            self.handle = None
         queue, self.queue = self.queue, []
-        for item, value in zip(queue, values):
+        ensure_future(self._dispatch(queue))
+
+    async def _dispatch(self, queue: List['Loader']):
+        batches = self._partition(queue)
+        if len(batches) == 1:
+            return await self._dispatch_batch(batches[0])
+
+        semaphore = Semaphore(self.max_concurrency or len(batches))
+        await gather(*[self._dispatch_batch(batch, semaphore)
+                       for batch in batches])
+
+    def _partition(self, queue: List['Loader']) -> List[List['Loader']]:
+        size = self.max_batch_size or len(queue) or 1
+        return [queue[index:index + size]
+                for index in range(0, len(queue), size)] or [[]]
+
+    async def _dispatch_batch(self, batch: List['Loader'],
+                              semaphore: Semaphore = None):
+        ids = list(dict.fromkeys(item.id for item in batch))
+        fields = self._projection(batch)
+        self._bind_abandonment(batch, current_task())
+        try:
+            values = await self._fetch_batch(ids, fields, semaphore)
+        except CancelledError:
+            self._abandon(batch)
+            raise
+        except Exception as error:
+            return self._terminate(batch, error)
+
+        index = dict(zip(ids, values))
+        for item in batch:
+            if self.cache.data.get(item.id) is item.future:
+                self._project(item.id, fields)
+            value = index[item.id]
             if item.future.done():
                 continue
             if isinstance(value, Exception):
@@ -53,23 +201,117 @@ class DataLoader(ABC):
             else:
                 item.future.set_result(value)
 
-    def _terminate(self, error: Exception):
-        self.cache = {}
-        queue, self.queue = self.queue, []
-        for item in queue:
-            item.future.set_exception(error)
+    def _projection(self, batch: List['Loader']) -> Projection:
+        fields: FrozenSet[str] = frozenset()
+        for item in batch:
+            if item.fields is None:
+                return None
+            fields |= item.fields
+        return fields
+
+    async def _fetch_batch(self, ids: List[str], fields: Projection,
+                           semaphore: Semaphore = None) -> List[Any]:
+        if not semaphore:
+            return await self._fetch(ids, fields)
+        async with semaphore:
+            return await self._fetch(ids, fields)
+
+    def _bind_abandonment(self, batch: List['Loader'], task: Any):
+        pending = len(batch)
+
+        def abandon(future: Future) -> None:
+            nonlocal pending
+            if future.cancelled():
+                pending -= 1
+                if not pending:
+                    task.cancel()
+
+        for item in batch:
+            item.future.add_done_callback(abandon)
+
+    async def _fetch(self, keys: List[str],
+                     fields: Projection = None) -> List[Any]:
+        ids = keys
+        shared: Dict[str, Any] = {}
+        if self.shared_cache:
+            shared = await self.shared_cache.get_many(self.name, keys)
+            ids = [id_ for id_ in keys if id_ not in shared]
+
+        values: List[Any] = []
+        if ids:
+            start = self.loop.time()
+            kwargs = {} if fields is None else {'fields': fields}
+            values = self._align(ids, await self.fetch(ids, **kwargs))
+            latency = self.loop.time() - start
+            self.scheduler.observe(len(ids), latency)
+            if self.instrumentation:
+                self.instrumentation.record_fetch(
+                    self.label, len(ids), latency)
+
+        if len(values) != len(ids):
+            raise TypeError(
+                "Unequal number of elements returned by fetch: "
+                f"<ids>: {ids} <values>: {values}")
+
+        if not self.shared_cache:
+            return values
+
+        fetched = dict(zip(ids, values))
+        if fields is None:
+            await self.shared_cache.set_many(self.name, {
+                id_: value for id_, value in fetched.items()
+                if value is not None and not isinstance(value, Exception)})
+        shared.update(fetched)
+        return [shared[key] for key in keys]
+
+    def _align(self, ids: List[str], result: FetchResult) -> List[Any]:
+        if not isinstance(result, Mapping):
+            return list(result or [])
+
+        values = []
+        for id_ in ids:
+            if id_ in result:
+                values.append(result[id_])
+            elif self.strict:
+                values.append(KeyError(f'Missing value for <id>: {id_}'))
+            else:
+                values.append(self.default)
+        return values
+
+    def _terminate(self, batch: List['Loader'], error: Exception):
+        for item in batch:
+            self.cache.pop(item.id, None)
+            if not item.future.done():
+                item.future.set_exception(error)
+
+    def _abandon(self, batch: List['Loader']):
+        for item in batch:
+            self.cache.pop(item.id, None)
+            item.future.cancel()
 
 
 class StandardDataLoader(DataLoader):
-    def __init__(self, fetch_function: FetchFunction,
-                 context: Dict[str, Any] = None) -> None:
-        super().__init__(context)
+    def __init__(self, fetch_function: Union[FetchFunction, Callable],
+                 context: Dict[str, Any] = None,
+                 executor: FetchExecutor = None, **options: Any) -> None:
+        super().__init__(context, **options)
         self.fetch_function = fetch_function
+        self.executor = executor or FetchExecutor()
+
+    async def fetch(self, ids: List[str],
+                    fields: Projection = None) -> FetchResult:
+        fetch_function: Callable[..., Any] = self.fetch_function
+        if fields is not None:
+            fetch_function = partial(fetch_function, fields=fields)
+
+        if iscoroutinefunction(fetch_function):
+            return await fetch_function(ids)
 
-    async def fetch(self, ids: List[str]) -> List[Any]:
-        return await self.fetch_function(ids)
+        result = await self.executor.run(fetch_function, ids)
+        return (await result) if isawaitable(result) else result
 
 
 class Loader(NamedTuple):
     id: str
     future: Future
+    fields: Projection = None
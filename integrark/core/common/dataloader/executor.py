@@ -0,0 +1,60 @@
+from asyncio import Semaphore, CancelledError, get_event_loop
+from concurrent.futures import Executor
+from typing import Optional, Dict, Callable, Any
+
+
+class FetchExecutor:
+    """Run synchronous fetch callables in a thread or process pool
+
+    Calls beyond 'max_concurrency' wait on the event loop instead of
+    piling up in the pool, so cancelled requests never reach it.
+    """
+
+    def __init__(self, executor: Executor = None,
+                 max_concurrency: int = 0) -> None:
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.semaphore: Optional[Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    async def run(self, function: Callable, *args: Any) -> Any:
+        if self.max_concurrency and not self.semaphore:
+            self.semaphore = Semaphore(self.max_concurrency)
+
+        self.waiting += 1
+        try:
+            if self.semaphore:
+                await self.semaphore.acquire()
+        except CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            result = await get_event_loop().run_in_executor(
+                self.executor, function, *args)
+        except CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            if self.semaphore:
+                self.semaphore.release()
+
+        self.completed += 1
+        return result
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'waiting': self.waiting, 'running': self.running,
+                'completed': self.completed, 'failed': self.failed,
+                'cancelled': self.cancelled}
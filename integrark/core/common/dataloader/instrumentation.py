@@ -0,0 +1,101 @@
+from bisect import bisect_left
+from typing import Optional, Dict, Sequence, Any
+
+
+BATCH_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000]
+
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1, 2.5, 5]
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        bounds = [*self.buckets, float('inf')]
+        return {'count': self.count, 'sum': self.sum, 'mean': self.mean,
+                'buckets': dict(zip(bounds, self.counts))}
+
+
+class LoaderMetrics:
+    def __init__(self) -> None:
+        self.loads = 0
+        self.hits = 0
+        self.deduplicated = 0
+        self.fetched = 0
+        self.batch_sizes = Histogram(BATCH_BUCKETS)
+        self.latencies = Histogram(LATENCY_BUCKETS)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        loads = self.loads or 1
+        return {
+            'loads': self.loads,
+            'hits': self.hits,
+            'deduplicated': self.deduplicated,
+            'fetched': self.fetched,
+            'batches': self.batch_sizes.count,
+            'hit_ratio': self.hits / loads,
+            'dedup_ratio': self.deduplicated / loads,
+            'batch_size': self.batch_sizes.stats,
+            'latency': self.latencies.stats
+        }
+
+
+class Instrumentation:
+    """Loader metrics aggregated per request and forwarded to the process
+
+    Loads served by resolved cache entries count as hits, while those
+    joining a still pending fetch of the same id count as deduplicated.
+    """
+
+    def __init__(self, enabled: bool = True,
+                 parent: 'Instrumentation' = None) -> None:
+        self.enabled = enabled
+        self.parent = parent
+        self.loaders: Dict[str, LoaderMetrics] = {}
+
+    def child(self) -> Optional['Instrumentation']:
+        return Instrumentation(parent=self) if self.enabled else None
+
+    def record_load(self, label: str, hit: bool = False,
+                    deduplicated: bool = False) -> None:
+        metrics = self._metrics(label)
+        metrics.loads += 1
+        metrics.hits += hit
+        metrics.deduplicated += deduplicated
+        if self.parent:
+            self.parent.record_load(label, hit, deduplicated)
+
+    def record_fetch(self, label: str, size: int, latency: float) -> None:
+        metrics = self._metrics(label)
+        metrics.fetched += size
+        metrics.batch_sizes.observe(size)
+        metrics.latencies.observe(latency)
+        if self.parent:
+            self.parent.record_fetch(label, size, latency)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {label: metrics.stats
+                for label, metrics in self.loaders.items()}
+
+    def _metrics(self, label: str) -> LoaderMetrics:
+        metrics = self.loaders.get(label)
+        if metrics is None:
+            metrics = self.loaders[label] = LoaderMetrics()
+        return metrics
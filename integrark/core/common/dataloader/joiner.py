@@ -1,64 +1,211 @@
-from typing import List, Dict, Any
-from modelark import Repository
-from .dataloader import StandardDataLoader
+from asyncio import Future, ensure_future, shield
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction, signature
+from typing import List, Dict, Mapping, Callable, Awaitable, Any
+from modelark import Repository, Domain
+from ..security import Enforcer, SecurityContext
+from .dataloader import DataLoader, StandardDataLoader, Projection
+from .executor import FetchExecutor
+from .pagination import Page, GroupCollector, parse_order
+from .compact import ColumnStore, GroupView
+from .keys import Key, key_of, key_fields, key_domain
 
 
 class Joiner:
     def __init__(
-        self, join: Repository, target: str = '',
-        link: Repository = None, source: str = ''
+        self, join: Repository, target: Key = '',
+        link: Repository = None, source: Key = '', prime: str = '',
+        executor: FetchExecutor = None, page_size: int = 0,
+        compact: bool = False, key: Key = 'id',
+        enforcer: Enforcer = None, resource: str = ''
     ) -> None:
         self.join = join
         self.target = target
         self.link = link
         self.source = source
+        self.prime = prime
+        self.executor = executor or FetchExecutor()
+        self.page_size = page_size
+        self.compact = compact
+        self.key = key
+        self.enforcer = enforcer
+        self.resource = resource
 
-    def build(self, context: Dict[str, Any] = None):
-        fetch = self._many_to_one_fetch
+    def build(self, context: Dict[str, Any] = None,
+              page: Page = None, **options: Any):
+        fetch: Callable[..., Awaitable[Any]] = self._many_to_one_fetch
         if self.join and self.target:
             fetch = self._one_to_many_fetch
         if self.join and self.link:
             fetch = self._many_to_many_fetch
 
-        return StandardDataLoader(fetch, context)
+        if page and fetch != self._one_to_many_fetch:
+            raise ValueError(
+                'Pagination is only supported on one to many joins.')
+        if self.resource and options.get('name'):
+            raise ValueError(
+                'Secured joins can not use the shared cache tier.')
 
-    async def _many_to_one_fetch(self, ids: List[str]):
-        field = self.source or 'id'
-        return await self.join.search([(field, 'in', ids)])
+        context = {} if context is None else context
+        options.setdefault('label', (
+            f"{type(self.join).__name__}.{fetch.__name__.strip('_')}"))
+        if fetch == self._many_to_many_fetch:
+            fetch = partial(
+                self._many_to_many_fetch,
+                target_loader=self._target_loader(context))
+        if page:
+            fetch = partial(self._one_to_many_page_fetch, page=page)
+        if self.resource and not self.link:
+            fetch = partial(self._secure_fetch, fetch, context)
+        if self.prime:
+            fetch = partial(self._prime_fetch, fetch, context)
+
+        return StandardDataLoader(fetch, context, **options)
+
+    def _target_loader(self, context: Dict[str, Any]) -> DataLoader:
+        dataloaders = context.setdefault('dataloaders', {})
+        name = f'joiner:{id(self.join)}:{self.key}:{self.resource}'
+        loader = dataloaders.get(name)
+        if not loader:
+            loader = dataloaders[name] = Joiner(
+                self.join, source=self.key, executor=self.executor,
+                enforcer=self.enforcer, resource=self.resource
+            ).build(context)
+        return loader
+
+    async def _secure_fetch(self, fetch: Callable, context: Dict[str, Any],
+                            ids: List[str], fields: Projection = None):
+        restriction = await shield(self._restriction(context))
+        return await fetch(ids, fields=fields, restriction=restriction)
+
+    def _restriction(self, context: Dict[str, Any]) -> Future:
+        """Secure domain of the resource, computed once per request"""
+        assert self.enforcer and self.resource
+        domains = context.setdefault('secure_domains', {})
+        future = domains.get(self.resource)
+        if future is None:
+            security_context: SecurityContext = {
+                'user': context.get('user', {}),
+                'request': context.get('request'),
+                'memo': context.setdefault('security_memo', {})}
+            future = domains[self.resource] = ensure_future(
+                self.enforcer.secure(self.resource, security_context))
+        return future
+
+    async def _prime_fetch(self, fetch: Callable, context: Dict[str, Any],
+                           ids: List[str],
+                           fields: Projection = None) -> List[Any]:
+        result = await fetch(ids, fields=fields)
+        loader = context.get('dataloaders', {}).get(self.prime)
+        if not loader:
+            return result
+
+        values = result.values() if isinstance(result, Mapping) else result
+        for value in values:
+            entities = value if isinstance(
+                value, (list, GroupView)) else [value]
+            for entity in entities:
+                try:
+                    id_ = key_of(entity, self.key)
+                except AttributeError:
+                    continue
+                loader.prime(id_, entity, fields)
+
+        return result
+
+    async def _many_to_one_fetch(self, ids: List[str],
+                                 fields: Projection = None,
+                                 restriction: Domain = ()):
+        key = self.source or self.key
+        return {key_of(item, key): item for item in await self._search(
+            self.join, [*key_domain(key, ids), *restriction],
+            self._project(fields, key))}
+
+    async def _one_to_many_fetch(self, ids: List[str],
+                                 fields: Projection = None,
+                                 restriction: Domain = ()):
+        fields = self._project(fields, self.target)
+        items = await self._search(
+            self.join, [*key_domain(self.target, ids), *restriction], fields)
+        if self.compact:
+            store = ColumnStore(sorted(fields or []))
+            store.extend(items)
+            del items
+            groups = store.group(self.target)
+            return [groups.get(id_, []) for id_ in ids]
 
-    async def _one_to_many_fetch(self, ids: List[str]):
-        items = await self.join.search([(self.target, 'in', ids)])
         index: Dict = {}
         for item in items:
             index.setdefault(
-                getattr(item, self.target), []).append(item)
+                key_of(item, self.target), []).append(item)
 
         return [index.get(id_, []) for id_ in ids]
 
-    async def _many_to_many_fetch(self, ids: List[str]):
+    async def _one_to_many_page_fetch(self, ids: List[str],
+                                      fields: Projection = None,
+                                      restriction: Domain = (), *,
+                                      page: Page):
+        collector = GroupCollector(self.target, page)
+        order = page.order
+        order_fields = [field for field, _ in parse_order(order)]
+        if self.page_size:
+            # Offset scans need a total order to not skip or repeat items
+            tiebreak = [field for field in dict.fromkeys(
+                key_fields(self.target) + key_fields(self.key))
+                if field not in order_fields]
+            order = ', '.join(filter(None, [order, *tiebreak]))
+            order_fields += tiebreak
+        fields = self._project(fields, self.target)
+        if fields is not None:
+            fields |= set(order_fields)
+
+        # Without a 'page_size' the whole child set is fetched at once
+        offset = 0
+        while True:
+            items = await self._search(
+                self.join, [*key_domain(self.target, ids), *restriction],
+                fields, limit=self.page_size or None, offset=offset or None,
+                order=order or None)
+            for item in items:
+                collector.add(item)
+            if not self.page_size or len(items) < self.page_size:
+                break
+            offset += self.page_size
+
+        return [collector.result(id_) for id_ in ids]
+
+    async def _many_to_many_fetch(self, ids: List[str],
+                                  fields: Projection = None, *,
+                                  target_loader: DataLoader):
         assert self.link and self.source and self.target
-        joints = await self.link.search([(self.source, 'in', ids)])
+        joints = await self._search(
+            self.link, key_domain(self.source, ids))
+        if self.compact:
+            return await self._many_to_many_compact(
+                ids, joints, fields, target_loader)
 
         index: Dict = {}
         for joint in filter(None, joints):  # type: ignore
             index.setdefault(
-                getattr(joint, self.source), []).append(joint)
+                key_of(joint, self.source), []).append(joint)
 
         links = [index.get(id_, []) for id_ in ids]
 
         ids_index: Dict = {}
-        target_ids = set()
+        target_ids: Dict = {}
         for item_list in links:
             for item in item_list:
-                source_id = getattr(item, self.source)
-                target_id = getattr(item, self.target)
+                source_id = key_of(item, self.source)
+                target_id = key_of(item, self.target)
                 ids_index.setdefault(
                     source_id, []).append(target_id)
-                target_ids.add(target_id)
+                target_ids[target_id] = True
 
         target_index = {
-            target.id: target for target in await self.join.search(
-                [('id', 'in', list(target_ids))]) if target}
+            target_id: target for target_id, target in zip(
+                target_ids, await target_loader.load_many(
+                    list(target_ids), self._project(fields, self.key)))
+            if target}
 
         # List of lists
         result = []
@@ -68,3 +215,49 @@ class Joiner:
             result.append(targets)
 
         return result
+
+    async def _many_to_many_compact(
+            self, ids: List[str], joints: List[Any],
+            fields: Projection, target_loader: DataLoader):
+        store = ColumnStore(dict.fromkeys(
+            key_fields(self.source) + key_fields(self.target)))
+        requested = set(ids)
+        store.extend(joint for joint in joints if joint and (
+            key_of(joint, self.source) in requested))
+        del joints
+
+        target_column = store.keys(self.target)
+        target_ids = list(dict.fromkeys(target_column))
+        target_index = {
+            target_id: target for target_id, target in zip(
+                target_ids, await target_loader.load_many(
+                    target_ids, self._project(fields, self.key)))
+            if target}
+
+        groups = store.group(self.source, lambda index: target_index.get(
+            target_column[index], []))
+        return [groups.get(id_, []) for id_ in ids]
+
+    def _project(self, fields: Projection, key: Key) -> Projection:
+        if fields is None:
+            return None
+        if self.prime:
+            # Primed entities are keyed by the sibling loader's key
+            key = (*key_fields(key), *key_fields(self.key))
+        return fields | set(key_fields(key))
+
+    async def _search(self, repository: Repository, domain: Domain,
+                      fields: Projection = None, **options: Any):
+        search = repository.search
+        kwargs = {key: value for key, value in options.items()
+                  if value is not None}
+        if fields is not None and 'fields' in signature(search).parameters:
+            kwargs['fields'] = sorted(fields)
+        if kwargs:
+            search = partial(search, **kwargs)
+
+        if iscoroutinefunction(search):
+            return await search(domain)
+
+        result = await self.executor.run(search, domain)
+        return (await result) if isawaitable(result) else result
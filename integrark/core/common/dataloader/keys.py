@@ -0,0 +1,32 @@
+from typing import List, Tuple, Union, Iterable, Any
+from modelark import Domain
+
+
+Key = Union[str, Tuple[str, ...]]
+
+
+def key_of(item: Any, key: Key) -> Any:
+    if isinstance(key, tuple):
+        return tuple(getattr(item, field) for field in key)
+    return getattr(item, key)
+
+
+def key_fields(key: Key) -> Tuple[str, ...]:
+    return key if isinstance(key, tuple) else (key,)
+
+
+def key_domain(key: Key, ids: Iterable[Any]) -> Domain:
+    """Domain matching a superset of the given (possibly composite) ids
+
+    Composite keys are searched with one 'in' term per column and the
+    exact tuples are picked afterwards when indexing the results.
+    """
+    if not isinstance(key, tuple):
+        return [(key, 'in', list(ids))]
+
+    columns: List[dict] = [{} for _ in key]
+    for id_ in ids:
+        for column, value in zip(columns, id_):
+            column[value] = True
+    return [(field, 'in', list(column))
+            for field, column in zip(key, columns)]
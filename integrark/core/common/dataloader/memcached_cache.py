@@ -0,0 +1,152 @@
+import logging
+from asyncio import TimeoutError, gather
+from datetime import date, time, timedelta
+from decimal import Decimal
+from hashlib import sha1
+from time import monotonic
+from typing import List, Dict, Tuple, Callable, Any
+from uuid import UUID
+from aiomcache import ClientException
+from msgpack import packb, unpackb
+from .shared_cache import SharedCache
+
+
+logger = logging.getLogger(__name__)
+
+CLIENT_ERRORS = (ClientException, OSError, TimeoutError)
+SERIALIZATION_ERRORS = (TypeError, ValueError, OverflowError)
+
+
+def default(value: Any) -> Any:
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return vars(value)
+
+
+def dumps(value: Any) -> bytes:
+    return packb(value, default=default)
+
+
+def loads(data: bytes) -> Any:
+    return unpackb(data)
+
+
+class MemcachedCache(SharedCache):
+    """Shared cache tier stored in memcached for every integrark node
+
+    Values are serialized with msgpack. Objects are packed as their
+    attribute dicts and dates, decimals and uuids as strings, so pass a
+    custom 'loads' to rebuild entities, otherwise warm loads return
+    dicts where cold ones return objects. The tier is best-effort:
+    client and serialization errors are logged and taken as misses or
+    skipped writes, so loads always fall back to their fetch function.
+    Whole-name invalidations bump a generation counter in memcached
+    that other nodes pick up within 'generation_ttl' seconds.
+    """
+
+    def __init__(self, client: Any, ttl: float = 300,
+                 prefix: str = 'integrark',
+                 dumps: Callable[[Any], bytes] = dumps,
+                 loads: Callable[[bytes], Any] = loads,
+                 generation_ttl: float = 1,
+                 clock: Callable[[], float] = monotonic) -> None:
+        super().__init__(ttl, clock)
+        self.client = client
+        self.prefix = prefix
+        self.dumps = dumps
+        self.loads = loads
+        self.generation_ttl = generation_ttl
+        self.generations: Dict[str, Tuple[int, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, name: str, ids: List[str]) -> Dict[str, Any]:
+        try:
+            generation = await self._generation(name)
+            keys = [self._key(name, generation, id_) for id_ in ids]
+            values = await self.client.multi_get(*keys) if keys else ()
+        except CLIENT_ERRORS as error:
+            logger.warning(f'Shared cache get failed for <{name}>: {error}')
+            self.misses += len(ids)
+            return {}
+
+        result = {}
+        for id_, value in zip(ids, values):
+            if value is not None:
+                try:
+                    result[id_] = self.loads(value)
+                except SERIALIZATION_ERRORS as error:
+                    logger.warning(
+                        f'Unreadable shared cache value <{name}:{id_}>: '
+                        f'{error}')
+            if id_ in result:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return result
+
+    async def set_many(self, name: str, values: Dict[str, Any]) -> None:
+        entries = {}
+        for id_, value in values.items():
+            try:
+                entries[id_] = self.dumps(value)
+            except SERIALIZATION_ERRORS as error:
+                logger.warning(
+                    f'Unserializable shared cache value <{name}:{id_}>: '
+                    f'{error}')
+
+        try:
+            generation = await self._generation(name)
+            exptime = int(self.ttl)
+            await gather(*[
+                self.client.set(self._key(name, generation, id_),
+                                data, exptime)
+                for id_, data in entries.items()])
+        except CLIENT_ERRORS as error:
+            logger.warning(f'Shared cache set failed for <{name}>: {error}')
+
+    async def invalidate(self, name: str, ids: List[str] = None) -> None:
+        if ids is not None:
+            generation = await self._generation(name)
+            await gather(*[
+                self.client.delete(self._key(name, generation, id_))
+                for id_ in ids])
+            return
+
+        key = self._generation_key(name)
+        try:
+            await self.client.incr(key)
+        except ClientException:
+            await self.client.add(key, b'1')
+        self.generations.pop(name, None)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _key(self, name: str, generation: int, id_: str) -> bytes:
+        key = f'{self.prefix}:{name}:{generation}:{id_}'.encode()
+        if len(key) > 250 or any(chr(byte).isspace() for byte in key):
+            digest = sha1(str(id_).encode()).hexdigest()
+            key = f'{self.prefix}:{name}:{generation}:#{digest}'.encode()
+        return key
+
+    async def _generation(self, name: str) -> int:
+        generation, expiration = self.generations.get(name, (0, 0.0))
+        if expiration > self.clock():
+            return generation
+
+        value = await self.client.get(self._generation_key(name))
+        generation = int(value or 0)
+        self.generations[name] = (
+            generation, self.clock() + self.generation_ttl)
+        return generation
+
+    def _generation_key(self, name: str) -> bytes:
+        return f'{self.prefix}:{name}:generation'.encode()
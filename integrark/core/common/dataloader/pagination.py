@@ -0,0 +1,113 @@
+from base64 import b64encode, b64decode
+from bisect import insort
+from itertools import count
+from typing import List, Dict, Tuple, Optional, NamedTuple, Any
+from .keys import Key, key_of
+
+
+class Page(NamedTuple):
+    limit: Optional[int] = None
+    offset: int = 0
+    order: str = ''
+    after: str = ''
+    connection: bool = False
+
+    @property
+    def start(self) -> int:
+        return decode_cursor(self.after) + 1 if self.after else self.offset
+
+    @property
+    def size(self) -> Optional[int]:
+        """Items to keep per group, including one to detect next pages"""
+        return None if self.limit is None else self.start + self.limit + 1
+
+
+def encode_cursor(position: int) -> str:
+    return b64encode(f'position:{position}'.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    return int(b64decode(cursor.encode()).decode().split(':')[-1])
+
+
+def parse_order(order: str) -> List[Tuple[str, bool]]:
+    fields = []
+    for field in filter(None, order.split(',')):
+        key, *direction = field.split()
+        fields.append((key, 'desc' in [item.lower() for item in direction]))
+    return fields
+
+
+class SortKey:
+    __slots__ = ('values', 'directions', 'sequence')
+
+    def __init__(self, values: Tuple, directions: Tuple[bool, ...],
+                 sequence: int) -> None:
+        self.values = values
+        self.directions = directions
+        self.sequence = sequence
+
+    def __lt__(self, other: 'SortKey') -> bool:
+        for value, other_value, descending in zip(
+                self.values, other.values, self.directions):
+            if value == other_value:
+                continue
+            if value is None or other_value is None:
+                # Nulls go last on ascending and first on descending
+                less = other_value is None
+            else:
+                less = value < other_value
+            return not less if descending else less
+        return self.sequence < other.sequence
+
+
+class GroupCollector:
+    """Keep only the first 'page.size' items of every group in order"""
+
+    def __init__(self, key: Key, page: Page) -> None:
+        self.key = key
+        self.page = page
+        self.order = parse_order(page.order)
+        self.directions = tuple(descending for _, descending in self.order)
+        self.sequence = count()
+        self.groups: Dict[
+            Any, List[Tuple[Optional[SortKey], Any]]] = {}
+
+    def add(self, item: Any) -> None:
+        group = self.groups.setdefault(key_of(item, self.key), [])
+        size = self.page.size
+        if not self.order:
+            if size is None or len(group) < size:
+                group.append((None, item))
+            return
+
+        sort_key = SortKey(
+            tuple(getattr(item, field) for field, _ in self.order),
+            self.directions, next(self.sequence))
+        if size is not None and len(group) >= size and not (
+                sort_key < group[-1][0]):  # type: ignore
+            return
+
+        insort(group, (sort_key, item))  # type: ignore
+        if size is not None and len(group) > size:
+            group.pop()
+
+    def result(self, id_: Any) -> Any:
+        items = [item for _, item in self.groups.get(id_, [])]
+        start, limit = self.page.start, self.page.limit
+        end = None if limit is None else start + limit
+        selection = items[start:end]
+        if not self.page.connection:
+            return selection
+
+        return {
+            'edges': [{'node': item, 'cursor': encode_cursor(start + index)}
+                      for index, item in enumerate(selection)],
+            'pageInfo': {
+                'hasPreviousPage': start > 0,
+                'hasNextPage': end is not None and len(items) > end,
+                'startCursor': selection and encode_cursor(start) or None,
+                'endCursor': selection and encode_cursor(
+                    start + len(selection) - 1) or None
+            }
+        }
@@ -0,0 +1,56 @@
+class TickScheduler:
+    """Close every batch after a single event loop tick"""
+
+    threshold = 0
+
+    def delay(self) -> float:
+        return 0
+
+    def observe(self, size: int, latency: float) -> None:
+        pass
+
+
+class WindowScheduler(TickScheduler):
+    """Close batches after 'window' microseconds or 'threshold' loads"""
+
+    def __init__(self, window: float = 1000, threshold: int = 0) -> None:
+        self.window = window
+        self.threshold = threshold
+
+    def delay(self) -> float:
+        return self.window / 1_000_000
+
+
+class AdaptiveScheduler(WindowScheduler):
+    """Tune the batch window from observed fetch latency and batch fill
+
+    Waiting a 'factor' fraction of the smoothed fetch latency is cheap
+    compared to an extra round-trip, so that is the window target while
+    batches keep coalescing loads. Batches holding a single load gain
+    nothing from waiting and halve the window instead, while batches
+    that already fill the 'threshold' never grow it.
+    """
+
+    def __init__(self, window: float = 1000, threshold: int = 0,
+                 min_window: float = 0, max_window: float = 5000,
+                 factor: float = 0.1, smoothing: float = 0.2) -> None:
+        super().__init__(window, threshold)
+        self.min_window = min_window
+        self.max_window = max_window
+        self.factor = factor
+        self.smoothing = smoothing
+        self.latency = 0.0
+        self.fill = 0.0
+
+    def observe(self, size: int, latency: float) -> None:
+        latency = latency * 1_000_000
+        self.latency += self.smoothing * (latency - self.latency)
+        fill = size / self.threshold if self.threshold else 0
+        self.fill += self.smoothing * (fill - self.fill)
+
+        window = self.factor * self.latency
+        if size <= 1:
+            window = self.window / 2
+        elif self.fill >= 1:
+            window = min(window, self.window)
+        self.window = min(max(window, self.min_window), self.max_window)
@@ -0,0 +1,52 @@
+from time import monotonic
+from typing import List, Dict, Callable, Any
+from .cache import TtlCache
+
+
+class SharedCache:
+    """Process-wide cache tier shared by every request's named loaders
+
+    Cached values are handed to several requests at once, so they
+    must be treated as read-only by the integrations consuming them.
+    Every loader name keeps at most 'max_entries' values.
+    """
+
+    def __init__(self, ttl: float = 300,
+                 clock: Callable[[], float] = monotonic,
+                 max_entries: int = 10000) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self.caches: Dict[str, TtlCache] = {}
+
+    async def get_many(self, name: str, ids: List[str]) -> Dict[str, Any]:
+        cache = self._cache(name)
+        result = {}
+        for id_ in ids:
+            value = cache.get(id_)
+            if value is not None:
+                result[id_] = value
+        return result
+
+    async def set_many(self, name: str, values: Dict[str, Any]) -> None:
+        cache = self._cache(name)
+        for id_, value in values.items():
+            cache.set(id_, value)
+
+    async def invalidate(self, name: str, ids: List[str] = None) -> None:
+        cache = self._cache(name)
+        if ids is None:
+            return cache.clear()
+        for id_ in ids:
+            cache.pop(id_)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: cache.stats for name, cache in self.caches.items()}
+
+    def _cache(self, name: str) -> TtlCache:
+        cache = self.caches.get(name)
+        if cache is None:
+            cache = self.caches[name] = TtlCache(
+                self.ttl, self.clock, self.max_entries)
+        return cache
@@ -1 +1,4 @@
 from .enforcer import *
+from .policy_index import *
+from .restriction_compiler import *
+from .authorize import *
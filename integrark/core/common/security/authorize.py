@@ -0,0 +1,30 @@
+from functools import wraps
+from typing import Tuple, Callable, Any
+from .common import AuthorizationError, SecurityContext
+
+
+def authorize(*pairs: Tuple[str, str],
+              enforcer: str = 'enforcer') -> Callable:
+    """Check (resource, operation) pairs before a Solution resolver runs
+
+    All pairs are checked with a single 'check_many' call, using the
+    Enforcer stored in the solution attribute named by 'enforcer'.
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        async def wrapper(self, parent: Any, info: Any, **kwargs: Any):
+            context: SecurityContext = {
+                'user': info.context['user'],
+                'request': info.context.get('request')}
+            decisions = await getattr(self, enforcer).check_many(
+                pairs, context)
+            denied = [f'<{operation}> for <{resource}>' for (
+                resource, operation), allowed in zip(pairs, decisions)
+                if not allowed]
+            if denied:
+                raise AuthorizationError(
+                    f'Operations {", ".join(denied)} '
+                    f'missing in roles {context["user"]["roles"]}')
+            return await method(self, parent, info, **kwargs)
+        return wrapper
+    return decorator
@@ -1,4 +1,4 @@
-from typing import List, Any, Protocol, TypedDict
+from typing import List, Dict, Any, Protocol, TypedDict
 from modelark import Repository
 
 
@@ -11,11 +11,15 @@ class User(TypedDict):
     roles: List[str]
 
 
-class SecurityContext(TypedDict):
+class RequestContext(TypedDict):
     user: User
     request: Any
 
 
+class SecurityContext(RequestContext, total=False):
+    memo: Dict[Any, Any]
+
+
 class Resolver(Protocol):
     def resolve(self, target: str) -> Repository:
         """Resolve method to be provided"""
@@ -1,50 +1,167 @@
 import json
-from itertools import groupby
+from asyncio import Semaphore, ensure_future, gather, shield
 from operator import itemgetter
+from time import perf_counter
+from typing import (
+    List, Dict, Tuple, Sequence, FrozenSet, Optional, Any)
 from modelark import Repository, Domain
 from filtrark import SafeEval
 from .common import AuthorizationError, SecurityContext, Resolver
+from .policy_index import PolicyIndex
+from .restriction_compiler import RestrictionCompiler
+from ..dataloader.cache import TtlCache
+from ..dataloader.instrumentation import Instrumentation
+
+
+PERSONAL = frozenset(['user', 'request'])
 
 
 class Enforcer:
-    def __init__(self, resolver: Resolver) -> None:
+    def __init__(self, resolver: Resolver, ttl: float = 300,
+                 max_concurrency: int = 0,
+                 instrumentation: Instrumentation = None,
+                 max_decisions: int = 4096) -> None:
         self.safe_eval = SafeEval(prefix='')
         self.resolver = resolver
         self.policy_repository = self.resolver.resolve('policy')
         self.restriction_repository = self.resolver.resolve('restriction')
+        self.policies = PolicyIndex(self.policy_repository, ttl)
+        self.compiler = RestrictionCompiler()
+        self.max_concurrency = max_concurrency
+        self.semaphore: Optional[Semaphore] = None
+        self.instrumentation = instrumentation
+        self.decisions = TtlCache(ttl, max_entries=max_decisions)
 
     async def check(self, resource: str, operation: str,
                     context: SecurityContext) -> None:
-        policies = await self._get_policies(resource, context)
-        privileges = "".join([policy.privilege for policy in policies])
-        if operation not in privileges:
+        if not (await self.check_many([(resource, operation)], context))[0]:
             raise AuthorizationError(
                 f'Operation <{operation}> for resource <{resource}> '
                 f'missing in roles {context["user"]["roles"]}')
 
+    async def check_many(self, pairs: Sequence[Tuple[str, str]],
+                         context: SecurityContext) -> List[bool]:
+        roles = self._role_ids(context)
+        decisions = {pair: self.decisions.get(('check', roles, *pair))
+                     for pair in pairs}
+        missing = [pair for pair, decision in decisions.items()
+                   if decision is None]
+        if missing:
+            policies = await self.policies.get_many(
+                [resource for resource, _ in missing], list(roles))
+            for resource, operation in missing:
+                decision = decisions[(resource, operation)] = (
+                    operation in "".join(
+                        policy.privilege for policy in policies[resource]))
+                self.decisions.set(
+                    ('check', roles, resource, operation), decision)
+
+        return [decisions[pair] for pair in pairs]
+
     async def secure(self, resource: str,
                      context: SecurityContext) -> Domain:
-        policies = await self._get_policies(resource, context)
+        return (await self.secure_many([resource], context))[0]
+
+    async def secure_many(self, resources: Sequence[str],
+                          context: SecurityContext) -> List[Domain]:
+        roles = self._role_ids(context)
+        domains = {resource: self.decisions.get(('secure', roles, resource))
+                   for resource in resources}
+        missing = [resource for resource, domain in domains.items()
+                   if domain is None]
+        if missing:
+            domains.update(await self._secure_many(missing, context, roles))
+
+        return [list(domains[resource]) for resource in resources]
+
+    async def preload(self) -> None:
+        await self.policies.preload()
+        self.decisions.clear()
+
+    def invalidate(self, resource: str = None, role_id: str = None) -> None:
+        self.policies.invalidate(resource, role_id)
+        for key in self.decisions:
+            if resource in (None, key[2]) and role_id in (None, *key[1]):
+                self.decisions.pop(key)
+
+    async def _secure_many(self, resources: List[str],
+                           context: SecurityContext,
+                           roles: FrozenSet[str]) -> Dict[str, Domain]:
+        policies = await self.policies.get_many(resources, list(roles))
         restrictions = await self.restriction_repository.search(
-            [('policy_id', 'in', [policy.id for policy in policies])])
+            [('policy_id', 'in', list(dict.fromkeys(
+                policy.id for resource in resources
+                for policy in policies[resource])))])
 
-        domain = []
-        for _, items in groupby(restrictions, key=lambda item: item.policy_id):
-            domain.extend(await self._compute_domain(context, items))
+        groups: Dict[str, List[Any]] = {}
+        for restriction in restrictions:
+            groups.setdefault(restriction.policy_id, []).append(restriction)
+
+        if self.max_concurrency and not self.semaphore:
+            self.semaphore = Semaphore(self.max_concurrency)
+
+        domains = dict(zip(groups, await gather(*[
+            self._compute_group(policy_id, dict(context), items)
+            for policy_id, items in groups.items()])))
+
+        result = {}
+        for resource in resources:
+            policy_ids = {policy.id for policy in policies[resource]}
+            result[resource] = [
+                term for policy_id, domain in domains.items()
+                if policy_id in policy_ids for term in domain]
+            if self._shareable([items for policy_id, items in groups.items()
+                                if policy_id in policy_ids]):
+                self.decisions.set(
+                    ('secure', roles, resource), result[resource])
+
+        return result
 
-        return domain
+    def _shareable(self, groups: List[List[Any]]) -> bool:
+        """Whether the domains of these groups are the same for every user
 
-    async def _get_policies(self, resource: str, context: SecurityContext):
-        user = context['user']
-        role_ids = [role.split('|')[-1] for role in user['roles']]
-        return await self.policy_repository.search(
-            [('resource', '=', resource), ('role_id', 'in', role_ids)])
+        Chained groups search live data, so they are never shared.
+        """
+        return all(len(items) == 1 and not (
+            self.compiler.names(items[0]) & PERSONAL) for items in groups)
+
+    def _role_ids(self, context: SecurityContext) -> FrozenSet[str]:
+        return frozenset(
+            role.split('|')[-1] for role in context['user']['roles'])
+
+    async def _compute_group(self, policy_id: str, context: Dict[str, Any],
+                             restrictions: List[Any]) -> Domain:
+        if self.semaphore:
+            await self.semaphore.acquire()
+        try:
+            start = perf_counter()
+            domain = await self._compute_domain(context, restrictions)
+            if self.instrumentation:
+                self.instrumentation.record_fetch(
+                    f'enforcer:{policy_id}', len(restrictions),
+                    perf_counter() - start)
+            return domain
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
 
     async def _compute_domain(self, context, restrictions) -> Domain:
         restrictions = sorted(restrictions, key=lambda item: item.sequence)
         last_restriction = restrictions.pop()
         for restriction in restrictions:
-            domain = self.safe_eval(restriction.domain, context)
-            repository = self.resolver.resolve(restriction.target)
-            context['previous'] = await repository.search(domain)
-        return self.safe_eval(last_restriction.domain, context)
+            domain = self.compiler(restriction, context)
+            context['previous'] = await self._search_restriction(
+                restriction, domain, context.get('memo'))
+        return self.compiler(last_restriction, context)
+
+    async def _search_restriction(self, restriction: Any, domain: Domain,
+                                  memo: Dict[Any, Any] = None) -> List[Any]:
+        """Search a chain step once per request when given a memo"""
+        repository = self.resolver.resolve(restriction.target)
+        if memo is None:
+            return await repository.search(domain)
+
+        key = (restriction.id, json.dumps(domain, default=str))
+        if key not in memo:
+            memo[key] = ensure_future(repository.search(domain))
+        return await shield(memo[key])
@@ -0,0 +1,82 @@
+from itertools import product
+from time import monotonic
+from typing import List, Dict, Tuple, Callable, Any
+from modelark import Repository
+
+
+class PolicyIndex:
+    """Policies grouped by (resource, role_id) and refreshed after 'ttl'
+
+    After a bulk 'preload', keys absent from the snapshot are known to
+    have no policies until the snapshot expires or gets invalidated.
+    """
+
+    def __init__(self, repository: Repository, ttl: float = 300,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.repository = repository
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: Dict[Tuple[str, str], Tuple[float, List[Any]]] = {}
+        self.snapshot = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, resource: str, role_ids: List[str]) -> List[Any]:
+        return (await self.get_many([resource], role_ids))[resource]
+
+    async def get_many(self, resources: List[str],
+                       role_ids: List[str]) -> Dict[str, List[Any]]:
+        now = self.clock()
+        role_ids = list(dict.fromkeys(role_ids))
+        policies: Dict[Tuple[str, str], List[Any]] = {}
+        missing = []
+        for key in product(dict.fromkeys(resources), role_ids):
+            expiration, items = self.entries.get(key, (self.snapshot, []))
+            if expiration > now:
+                policies[key] = items
+            else:
+                missing.append(key)
+
+        self.hits += len(policies)
+        self.misses += len(missing)
+        if missing:
+            found = self._group(await self.repository.search([
+                ('resource', 'in', list(dict.fromkeys(
+                    resource for resource, _ in missing))),
+                ('role_id', 'in', list(dict.fromkeys(
+                    role_id for _, role_id in missing)))]))
+            expiration = now + self.ttl
+            for key in missing:
+                items = policies[key] = found.get(key, [])
+                self.entries[key] = (expiration, items)
+
+        return {resource: [policy for role_id in role_ids
+                           for policy in policies[(resource, role_id)]]
+                for resource in resources}
+
+    async def preload(self) -> None:
+        expiration = self.clock() + self.ttl
+        self.entries = {key: (expiration, items) for key, items in
+                        self._group(await self.repository.search([])).items()}
+        self.snapshot = expiration
+
+    def invalidate(self, resource: str = None, role_id: str = None) -> None:
+        self.snapshot = 0.0
+        if resource is None and role_id is None:
+            self.entries.clear()
+            return
+        for key in [key for key in self.entries if (
+                resource in (None, key[0]) and role_id in (None, key[1]))]:
+            del self.entries[key]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries)}
+
+    def _group(self, policies: List[Any]) -> Dict[Tuple[str, str], List]:
+        groups: Dict[Tuple[str, str], List] = {}
+        for policy in policies:
+            groups.setdefault(
+                (policy.resource, policy.role_id), []).append(policy)
+        return groups
@@ -0,0 +1,79 @@
+import calendar
+import datetime
+import time
+from collections import OrderedDict
+from types import CodeType
+from typing import Tuple, Dict, FrozenSet, Any
+from modelark import Domain
+
+
+FORBIDDEN = ('__', '**')
+
+SAFE_BUILTINS = {
+    'abs': abs,
+    'calendar': calendar,
+    'datetime': datetime,
+    'float': float,
+    'int': int,
+    'max': max,
+    'min': min,
+    'round': round,
+    'str': str,
+    'sum': sum,
+    'time': time
+}
+
+
+class RestrictionCompiler:
+    """Restriction domains compiled once per restriction id and version
+
+    Evaluation follows filtrark's 'SafeEval' rules with its own copy of
+    the sandbox, but reuses the compiled code, so each call only
+    substitutes the security context. Restrictions without a 'version'
+    attribute are versioned by their domain text.
+    """
+
+    def __init__(self, prefix: str = '', max_entries: int = 1024) -> None:
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self.compiled: Dict[Tuple[str, Any], Any] = OrderedDict()
+
+    def __call__(self, restriction: Any,
+                 context: Dict[str, Any]) -> Domain:
+        code = self.compile(restriction)
+        if not isinstance(code, CodeType):
+            return code
+        return eval(code, {'__builtins__': {}},
+                    {**context, **SAFE_BUILTINS})
+
+    def compile(self, restriction: Any) -> Any:
+        expression = restriction.domain
+        if not isinstance(expression, str):
+            return expression
+
+        key = (restriction.id, getattr(restriction, 'version', expression))
+        if key in self.compiled:
+            self.compiled.move_to_end(key)  # type: ignore
+            return self.compiled[key]
+
+        code: Any = expression
+        if expression.startswith(self.prefix) and not any(
+                token in expression for token in FORBIDDEN):
+            code = compile(expression[len(self.prefix):].strip(),
+                           f'<restriction {restriction.id}>', 'eval')
+
+        self.compiled[key] = code
+        if len(self.compiled) > self.max_entries:
+            self.compiled.popitem(last=False)  # type: ignore
+        return code
+
+    def names(self, restriction: Any) -> FrozenSet[str]:
+        """Names a restriction may read, including attribute names"""
+        names: set = set()
+        codes = [self.compile(restriction)]
+        while codes:
+            code = codes.pop()
+            if isinstance(code, CodeType):
+                names.update(code.co_names)
+                codes.extend(code.co_consts)
+        return frozenset(names)
@@ -1,3 +1,4 @@
 from .parse_domain import parse_domain, join_domains
 from .format import camel_to_snake, snake_to_camel
 from .normalize import normalize, normalize_domain
+from .selection import selected_fields
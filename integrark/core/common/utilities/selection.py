@@ -0,0 +1,26 @@
+from typing import List, Dict, Any
+from graphql import (
+    GraphQLResolveInfo, FieldNode, FragmentSpreadNode, InlineFragmentNode)
+from .format import camel_to_snake
+
+
+def selected_fields(info: GraphQLResolveInfo, snake=True) -> List[str]:
+    fields: Dict[str, Any] = {}
+    for field_node in info.field_nodes:
+        _collect(field_node.selection_set, info.fragments, fields)
+
+    names = [camel_to_snake(name) if snake else name for name in fields]
+    return list(dict.fromkeys(names))
+
+
+def _collect(selection_set, fragments, fields: Dict[str, Any]) -> None:
+    for selection in getattr(selection_set, 'selections', None) or []:
+        if isinstance(selection, FieldNode):
+            if not selection.name.value.startswith('__'):
+                fields[selection.name.value] = True
+        elif isinstance(selection, InlineFragmentNode):
+            _collect(selection.selection_set, fragments, fields)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment:
+                _collect(fragment.selection_set, fragments, fields)
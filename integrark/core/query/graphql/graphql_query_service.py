@@ -1,16 +1,51 @@
 import logging
-from typing import List, Dict, Any
-from graphql import GraphQLSchema, GraphQLObjectType, graphql, format_error
+from hashlib import sha256
+from inspect import isawaitable
+from typing import List, Dict, Tuple, Optional, Sequence, Any
+from graphql import (
+    GraphQLSchema, GraphQLObjectType, GraphQLError, DocumentNode, Node,
+    ExecutionResult, parse, validate, validate_schema, execute, format_error)
 from ....application.services import QueryService, QueryResult
-from ...common import IntegrationImporter, Solution
+from ...common import (
+    IntegrationImporter, Solution, SharedCache, Instrumentation,
+    MemoryCache, WeightedCache)
 from .graphql_schema_loader import GraphqlSchemaLoader
 
 
+NODE_SIZE = 512
+
+
+def document_weight(document: DocumentNode) -> int:
+    """Approximate a parsed document footprint in bytes
+
+    Every AST node, with its name, location and tokens, takes about
+    'NODE_SIZE' bytes.
+    """
+    nodes = 0
+    pending: List[Any] = [document]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, Node):
+            nodes += 1
+            pending.extend(getattr(item, key) for key in item.keys)
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return nodes * NODE_SIZE
+
+
 class GraphqlQueryService(QueryService):
 
     def __init__(self, schema_loader: GraphqlSchemaLoader,
-                 integration_importer: IntegrationImporter) -> None:
+                 integration_importer: IntegrationImporter,
+                 shared_cache: SharedCache = None,
+                 instrumentation: Instrumentation = None,
+                 documents: MemoryCache = None) -> None:
         self.logger = logging.getLogger(__name__)
+        self.shared_cache = shared_cache
+        self.instrumentation = instrumentation
+        self.documents = WeightedCache(
+            max_weight=2 ** 26, weigh=document_weight
+        ) if documents is None else documents
         self.schema = schema_loader.load()
         self.solutions = integration_importer.solutions
         self.schema = self._bind_schema(self.schema, self.solutions)
@@ -21,8 +56,24 @@ class GraphqlQueryService(QueryService):
         graphql_kwargs = context.pop('graphql', {'context_value': {}})
         graphql_context = graphql_kwargs['context_value']
         graphql_context.update({'dataloaders': {}})
+        if self.shared_cache:
+            graphql_context.setdefault('shared_cache', self.shared_cache)
+        instrumentation = (
+            self.instrumentation and self.instrumentation.child())
+        if instrumentation:
+            graphql_context['instrumentation'] = instrumentation
 
-        graphql_result = await graphql(self.schema, query, **graphql_kwargs)
+        document, document_errors = self._document(query)
+        if document:
+            graphql_result = execute(self.schema, document, **graphql_kwargs)
+            if isawaitable(graphql_result):
+                graphql_result = await graphql_result
+        else:
+            graphql_result = ExecutionResult(None, list(document_errors))
+
+        if instrumentation:
+            self.logger.debug(
+                f'Dataloader metrics: {instrumentation.stats}')
 
         data = graphql_result.data
         errors = []
@@ -32,6 +83,28 @@ class GraphqlQueryService(QueryService):
 
         return QueryResult(data, errors or None)
 
+    def _document(self, query: str) -> Tuple[
+            Optional[DocumentNode], Sequence[GraphQLError]]:
+        """Parsed and validated document, cached by the query digest"""
+        key = sha256(query.encode()).hexdigest()
+        document = self.documents.get(key)
+        if document:
+            return document, []
+
+        errors = validate_schema(self.schema)
+        if errors:
+            return None, errors
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            return None, [error]
+        errors = validate(self.schema, document)
+        if errors:
+            return None, errors
+
+        self.documents.set(key, document)
+        return document, []
+
     def _bind_schema(self, schema: GraphQLSchema,
                      solutions: List[Solution]) -> GraphQLSchema:
 
@@ -1,11 +1,15 @@
+from importlib import import_module
 from pathlib import Path
+from aiomcache import Client
 from injectark import Factory
 from ..application.services import (
     QueryService, StandardQueryService,
     RouteService, StandardRouteService)
 from ..application.managers import (
     ExecutionManager, RoutingManager)
-from ..core import Config, JwtSupplier, IntegrationImporter
+from ..core import (
+    Config, JwtSupplier, KeySet, IntegrationImporter,
+    SharedCache, MemcachedCache, Instrumentation)
 
 
 class BaseFactory(Factory):
@@ -29,8 +33,30 @@ class BaseFactory(Factory):
         return RoutingManager(route_service)
 
     def jwt_supplier(self) -> JwtSupplier:
-        secret = self.config.get('secrets', {}).get('jwt', '')
-        return JwtSupplier(secret)
+        secrets = self.config.get('secrets', {})
+        jwks = secrets.get('jwks')
+        return JwtSupplier(secrets.get('jwt', ''),
+                           key_set=KeySet(jwks) if jwks else None)
+
+    def shared_cache(self) -> SharedCache:
+        cache_config = self.config.get('cache', {})
+        ttl = cache_config.get('ttl', 300)
+        memcached = cache_config.get('memcached')
+        if not memcached:
+            return SharedCache(
+                ttl, max_entries=cache_config.get('max_entries', 10000))
+
+        options = {}
+        if cache_config.get('loads'):
+            module, _, name = cache_config['loads'].rpartition('.')
+            options['loads'] = getattr(import_module(module), name)
+
+        host, _, port = memcached.partition(':')
+        return MemcachedCache(
+            Client(host, int(port or 11211)), ttl, **options)
+
+    def instrumentation(self) -> Instrumentation:
+        return Instrumentation(self.config.get('instrumentation', False))
 
     def integration_importer(self) -> IntegrationImporter:
         integrations_directory = self.config['integrations_directory']
@@ -1,5 +1,6 @@
 from ..application.services import QueryService
-from ..core import Config, IntegrationImporter
+from ..core import (
+    Config, IntegrationImporter, SharedCache, Instrumentation)
 from ..core.query import GraphqlQueryService
 from ..core.query.graphql import GraphqlSchemaLoader
 from .rest_factory import RestFactory
@@ -10,7 +11,11 @@ class GraphqlFactory(RestFactory):
         self.config = config
 
     def query_service(
-            self, integration_importer: IntegrationImporter) -> QueryService:
+            self, integration_importer: IntegrationImporter,
+            shared_cache: SharedCache = None,
+            instrumentation: Instrumentation = None) -> QueryService:
         definitions_directory = self.config['definitions_directory']
         schema_loader = GraphqlSchemaLoader(definitions_directory)
-        return GraphqlQueryService(schema_loader, integration_importer)
+        return GraphqlQueryService(
+            schema_loader, integration_importer,
+            shared_cache, instrumentation)
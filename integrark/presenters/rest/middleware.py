@@ -1,6 +1,7 @@
 import logging
+from collections.abc import MutableMapping
 from json import dumps
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Iterator, Callable, Any
 from aiohttp import web
 from injectark import Injectark
 
@@ -9,17 +10,22 @@ def user_middleware_factory(injector: Injectark) -> Callable:
 
     jwt_supplier = injector['JwtSupplier']
 
-    @web.middleware
-    async def user_middleware(
-            request: web.Request, handler: Callable) -> web.Response:
-
+    def authenticate(request: web.Request) -> Dict[str, Any]:
         token = request.headers.get(
             'Authorization', '').replace('Bearer ', '')
         token = token or request.query.get('access_token', '')
 
-        token_payload = jwt_supplier.decode(token) or {}
+        return jwt_supplier.decode(
+            token, transform=extract_user) or extract_user({})
 
-        request['user'] = extract_user(token_payload)
+    @web.middleware
+    async def user_middleware(
+            request: web.Request, handler: Callable) -> web.Response:
+
+        if getattr(handler, 'authenticate', True):
+            request['user'] = LazyUser(lambda: authenticate(request))
+        else:
+            request['user'] = extract_user({})
 
         return await handler(request)
 
@@ -49,6 +55,48 @@ def errors_middleware_factory(injector: Injectark) -> Callable:
     return middleware
 
 
+def public(handler: Callable) -> Callable:
+    """Mark a route handler as not needing the request user"""
+    handler.authenticate = False  # type: ignore
+    return handler
+
+
+class LazyUser(MutableMapping):
+    """Request user decoded from its token on first access
+
+    It never leaves the presenter: resources decode it into the plain
+    dict handed to the integration contexts.
+    """
+
+    def __init__(self, load: Callable[[], Dict[str, Any]]) -> None:
+        self.load = load
+        self.user: Any = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self.user is None:
+            self.user = self.load()
+        return self.user
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return repr(self.data)
+
+
 def extract_user(payload: Dict[str, Any]) -> Dict[str, Any]:
     user = {
         'tid': '',
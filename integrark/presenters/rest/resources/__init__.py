@@ -2,12 +2,14 @@ from injectark import Injectark
 from aiohttp import web
 from aiohttp_jinja2 import template
 from .... import __version__
+from ..middleware import public
 from .graphql import GraphqlResource
 from .rest import RestResource
 
 
 class RootResource:
 
+    @public
     @template('index.html')
     async def get(self, request):
         return {'version': __version__}
@@ -3,6 +3,7 @@ from aiohttp import web
 from aiohttp_jinja2 import template
 from .... import __version__
 from ....application.managers import ExecutionManager
+from ..middleware import public
 
 
 class GraphqlResource:
@@ -11,6 +12,7 @@ class GraphqlResource:
             'ExecutionManager']
         self.injector = injector
 
+    @public
     @template('playground.html')
     async def get(self, request: web.Request):
         return {'version': __version__}
@@ -24,7 +26,7 @@ class GraphqlResource:
                     'injector': self.injector,
                     'request': request,
                     'client': request.app['client'],
-                    'user': request['user']
+                    'user': dict(request['user'])
                 },
                 'variable_values': payload.get('variables'),
                 'operation_name': payload.get('operationName')
@@ -21,7 +21,7 @@ class RestResource:
             'url': request.url,
             'request': request,
             'client': request.app['client'],
-            'user': request['user'],
+            'user': dict(request['user']),
             'location': location,
             'path': path,
             'route': route
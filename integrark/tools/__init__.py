@@ -7,8 +7,24 @@ from ..core import (
     Location,
     DataLoader,
     StandardDataLoader,
+    MemoryCache,
+    NullCache,
+    LruCache,
+    TtlCache,
+    WeightedCache,
+    TickScheduler,
+    WindowScheduler,
+    AdaptiveScheduler,
+    SharedCache,
+    MemcachedCache,
+    FetchExecutor,
+    Instrumentation,
+    Page,
+    ColumnStore,
     Joiner,
     Enforcer,
+    authorize,
     normalize,
-    normalize_domain
+    normalize_domain,
+    selected_fields
 )
@@ -1,6 +1,16 @@
 import jwt
+from time import time
 from pytest import fixture
 from integrark.core import JwtSupplier
+from integrark.core.common.crypto import jwt_supplier as jwt_supplier_module
+
+
+class MockClock:
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
 
 
 @fixture
@@ -41,3 +51,81 @@ def test_jwt_supplier_decode_invalid(jwt_supplier):
     result = jwt_supplier.decode(token, secret)
 
     assert result is None
+
+
+def test_jwt_supplier_decode_cached(jwt_supplier, monkeypatch):
+    calls = []
+    original = jwt_supplier_module.decode
+
+    def counted_decode(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_supplier_module, 'decode', counted_decode)
+    token = jwt.encode({'name': 'John'}, 'SECRET')
+
+    first = jwt_supplier.decode(token)
+    second = jwt_supplier.decode(token)
+    other = jwt_supplier.decode(token, 'OTHER')
+
+    assert first == second == {'name': 'John'}
+    assert first is not second
+    assert other is None
+    assert len(calls) == 2
+    assert jwt_supplier.cache.stats['hits'] == 1
+
+
+def test_jwt_supplier_decode_expiration(monkeypatch):
+    calls = []
+    original = jwt_supplier_module.decode
+
+    def counted_decode(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_supplier_module, 'decode', counted_decode)
+    now = int(time())
+    clock = MockClock(now)
+    jwt_supplier = JwtSupplier('SECRET', clock=clock)
+    token = jwt.encode(
+        {'name': 'John', 'nbf': now - 100, 'exp': now + 100}, 'SECRET')
+
+    jwt_supplier.decode(token)
+    jwt_supplier.decode(token)
+    assert len(calls) == 1
+
+    clock.now = now + 100
+    jwt_supplier.decode(token)
+    assert len(calls) == 2
+
+    clock.now = now - 200
+    jwt_supplier.decode(token)
+    assert len(calls) == 3
+
+
+def test_jwt_supplier_decode_transform(jwt_supplier):
+    token = jwt.encode({'name': 'John'}, 'SECRET')
+    calls = []
+
+    def transform(payload):
+        calls.append(payload)
+        return {'user': payload['name']}
+
+    first = jwt_supplier.decode(token, transform=transform)
+    second = jwt_supplier.decode(token, transform=transform)
+
+    first['user'] = 'Mutated'
+    assert second == {'user': 'John'}
+    assert jwt_supplier.decode(token, transform=transform) == {
+        'user': 'John'}
+    assert len(calls) == 1
+    assert jwt_supplier.decode('', transform=transform) is None
+
+
+def test_jwt_supplier_max_entries():
+    jwt_supplier = JwtSupplier('SECRET', max_entries=2)
+
+    for name in ['A', 'B', 'C']:
+        jwt_supplier.decode(jwt.encode({'name': name}, 'SECRET'))
+
+    assert len(jwt_supplier.cache) == 2
@@ -0,0 +1,110 @@
+import json
+import jwt
+from pytest import fixture
+from cryptography.hazmat.primitives.asymmetric import rsa, ec
+from jwt.algorithms import RSAAlgorithm
+from jwt.utils import base64url_encode
+from integrark.core import JwtSupplier, KeySet
+
+
+class MockClock:
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@fixture
+def private_keys():
+    return {
+        'rsa-1': rsa.generate_private_key(65537, 2048),
+        'ec-1': ec.generate_private_key(ec.SECP256R1())
+    }
+
+
+def ec_to_jwk(public_key):
+    numbers = public_key.public_numbers()
+    return {'kty': 'EC', 'crv': 'P-256',
+            'x': base64url_encode(numbers.x.to_bytes(32, 'big')).decode(),
+            'y': base64url_encode(numbers.y.to_bytes(32, 'big')).decode()}
+
+
+def write_key_set(path, private_keys):
+    keys = []
+    for kid, private_key in private_keys.items():
+        public_key = private_key.public_key()
+        key = json.loads(RSAAlgorithm.to_jwk(public_key)) if (
+            kid.startswith('rsa')) else ec_to_jwk(public_key)
+        key['kid'] = kid
+        keys.append(key)
+    path.write_text(json.dumps({'keys': keys}))
+
+
+@fixture
+def key_set_path(tmp_path, private_keys):
+    path = tmp_path / 'jwks.json'
+    write_key_set(path, private_keys)
+    return path
+
+
+def test_key_set_load(key_set_path):
+    key_set = KeySet(str(key_set_path))
+
+    assert set(key_set.keys) == {'rsa-1', 'ec-1'}
+    assert key_set.get('rsa-1').algorithm == 'RS256'
+    assert key_set.get('ec-1').algorithm == 'ES256'
+    assert key_set.get('missing') is None
+
+
+def test_key_set_reload(key_set_path, private_keys):
+    clock = MockClock()
+    key_set = KeySet(str(key_set_path), interval=5, clock=clock)
+    rsa_key = key_set.get('rsa-1')
+
+    write_key_set(key_set_path, {
+        'rsa-2': rsa.generate_private_key(65537, 2048)})
+    assert key_set.get('rsa-1') is rsa_key
+
+    clock.now = 5
+    assert key_set.get('rsa-1') is None
+    assert key_set.get('rsa-2') is not None
+    assert key_set.version == 2
+
+    key_set_path.write_text('{"keys": [')
+    clock.now = 10
+    assert key_set.get('rsa-2') is not None
+    assert key_set.version == 2
+
+
+def test_jwt_supplier_key_set(key_set_path, private_keys):
+    jwt_supplier = JwtSupplier('SECRET', key_set=KeySet(str(key_set_path)))
+    payload = {'name': 'John'}
+
+    rsa_token = jwt.encode(payload, private_keys['rsa-1'],
+                           algorithm='RS256', headers={'kid': 'rsa-1'})
+    ec_token = jwt.encode(payload, private_keys['ec-1'],
+                          algorithm='ES256', headers={'kid': 'ec-1'})
+    wrong_token = jwt.encode(payload, private_keys['ec-1'],
+                             algorithm='ES256', headers={'kid': 'rsa-1'})
+    secret_token = jwt.encode(payload, 'SECRET')
+
+    assert jwt_supplier.decode(rsa_token) == payload
+    assert jwt_supplier.decode(ec_token) == payload
+    assert jwt_supplier.decode(wrong_token) is None
+    assert jwt_supplier.decode(secret_token) == payload
+    assert jwt_supplier.decode('invalid') is None
+
+
+def test_jwt_supplier_key_set_without_secret(key_set_path, private_keys):
+    jwt_supplier = JwtSupplier('', key_set=KeySet(str(key_set_path)))
+    payload = {'uid': 'admin', 'roles': ['admin|x']}
+
+    forged_token = jwt.encode(payload, '')
+    unknown_token = jwt.encode(payload, '', headers={'kid': 'unknown'})
+    rsa_token = jwt.encode(payload, private_keys['rsa-1'],
+                           algorithm='RS256', headers={'kid': 'rsa-1'})
+
+    assert jwt_supplier.decode(forged_token) is None
+    assert jwt_supplier.decode(unknown_token) is None
+    assert jwt_supplier.decode(rsa_token) == payload
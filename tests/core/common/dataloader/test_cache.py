@@ -0,0 +1,168 @@
+from typing import List, Any
+from asyncio import sleep
+from integrark.core import (
+    StandardDataLoader, MemoryCache, NullCache,
+    LruCache, TtlCache, WeightedCache)
+
+
+class MockClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_cache():
+    cache = MemoryCache()
+
+    cache.set('1', 'one')
+
+    assert cache.get('1') == 'one'
+    assert cache.get('2') is None
+    assert '1' in cache
+    assert list(cache) == ['1']
+    assert cache.stats == {
+        'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+
+    assert cache.pop('1') == 'one'
+    assert len(cache) == 0
+
+
+def test_null_cache():
+    cache = NullCache()
+
+    cache.set('1', 'one')
+
+    assert cache.get('1') is None
+    assert len(cache) == 0
+    assert cache.misses == 1
+
+
+def test_lru_cache():
+    cache = LruCache(max_entries=2)
+
+    cache.set('1', 'one')
+    cache.set('2', 'two')
+    cache.get('1')
+    cache.set('3', 'three')
+
+    assert list(cache) == ['1', '3']
+    assert cache.evictions == 1
+    assert cache.hits == 1
+
+
+def test_ttl_cache():
+    clock = MockClock()
+    cache = TtlCache(ttl=10, clock=clock)
+
+    cache.set('1', 'one')
+    clock.now = 5
+    cache.set('2', 'two')
+
+    assert cache.get('1') == 'one'
+
+    clock.now = 12
+    assert cache.get('1') is None
+    assert cache.get('2') == 'two'
+    assert cache.evictions == 1
+
+    clock.now = 20
+    cache.set('3', 'three')
+
+    assert list(cache) == ['3']
+    assert cache.evictions == 2
+
+
+def test_ttl_cache_max_entries():
+    cache = TtlCache(ttl=10, max_entries=2)
+
+    for key in ['1', '2', '3']:
+        cache.set(key, key)
+    cache.set('2', 'two')
+
+    assert list(cache) == ['3', '2']
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_max_entries_recency():
+    cache = TtlCache(ttl=10, max_entries=3)
+
+    cache.set('hot', 'hot')
+    for index in range(10):
+        cache.set(str(index), index)
+        assert cache.get('hot') == 'hot'
+
+    assert list(cache) == ['8', '9', 'hot']
+    assert cache.evictions == 8
+
+
+def test_weighted_cache():
+    cache = WeightedCache(max_weight=10, weigh=len)
+
+    cache.set('1', 'aaaa')
+    cache.set('2', 'bbbb')
+    assert cache.weight == 8
+
+    cache.set('3', 'cccc')
+
+    assert list(cache) == ['2', '3']
+    assert cache.weight == 8
+    assert cache.evictions == 1
+
+    cache.pop('2')
+    assert cache.weight == 4
+
+    cache.clear()
+    assert cache.weight == 0
+
+
+async def test_weighted_cache_reweighs_resolved_futures():
+    async def fetch(ids: List[str]) -> List[Any]:
+        return ['x' * 6 for id in ids]
+
+    cache = WeightedCache(max_weight=10, weigh=len)
+    dataloader = StandardDataLoader(fetch, cache=cache)
+
+    future_list = dataloader.load_many(['1', '2'])
+    assert cache.weight == 2
+
+    await future_list
+    await sleep(0)
+
+    assert list(cache) == ['2']
+    assert cache.weight == 6
+
+
+async def test_dataloader_lru_cache():
+    fetched = []
+
+    async def fetch(ids: List[str]) -> List[Any]:
+        fetched.extend(ids)
+        return ids
+
+    dataloader = StandardDataLoader(fetch, cache=LruCache(max_entries=1))
+
+    await dataloader.load('1')
+    await dataloader.load('1')
+    await dataloader.load('2')
+    await dataloader.load('1')
+
+    assert fetched == ['1', '2', '1']
+    assert dataloader.cache.stats == {
+        'hits': 1, 'misses': 3, 'evictions': 2, 'size': 1}
+
+
+async def test_dataloader_null_cache():
+    fetched = []
+
+    async def fetch(ids: List[str]) -> List[Any]:
+        fetched.extend(ids)
+        return ids
+
+    dataloader = StandardDataLoader(fetch, cache=NullCache())
+
+    await dataloader.load('1')
+    await dataloader.load('1')
+
+    assert fetched == ['1', '1']
@@ -0,0 +1,64 @@
+from types import SimpleNamespace as SN
+from pytest import fixture, raises
+from integrark.core import ColumnStore, Row, GroupView
+
+
+@fixture
+def store():
+    store = ColumnStore()
+    store.extend([
+        SN(id='1', parent='B', name='alpha'),
+        SN(id='2', parent='A', name='beta'),
+        SN(id='3', parent='B', name='gamma'),
+    ])
+    return store
+
+
+def test_column_store_extend(store):
+    assert len(store) == 3
+    assert store.fields == ['id', 'parent', 'name']
+    assert store.columns['name'] == ['alpha', 'beta', 'gamma']
+
+
+def test_column_store_projected_fields():
+    store = ColumnStore(['id', 'name'])
+    store.extend([SN(id='1', name='alpha', extra='ignored')])
+
+    assert store.columns == {'id': ['1'], 'name': ['alpha']}
+
+
+def test_column_store_row(store):
+    row = store.row(1)
+
+    assert isinstance(row, Row)
+    assert row.name == 'beta'
+    assert getattr(row, 'missing', None) is None
+    assert vars(row.materialize()) == {
+        'id': '2', 'parent': 'A', 'name': 'beta'}
+
+
+def test_column_store_group(store):
+    groups = store.group('parent')
+
+    assert set(groups) == {'A', 'B'}
+    assert [row.name for row in groups['B']] == ['alpha', 'gamma']
+    assert [row.name for row in groups['A']] == ['beta']
+    assert ColumnStore().group('id') == {}
+
+
+def test_group_view_sequence(store):
+    view = store.group('parent')['B']
+
+    assert isinstance(view, GroupView)
+    assert len(view) == 2
+    assert view[-1].name == 'gamma'
+    assert [row.id for row in view[:1]] == ['1']
+    with raises(IndexError):
+        view[2]
+
+
+def test_group_view_resolve(store):
+    view = store.group('parent', lambda index: index)['B']
+
+    assert view == [0, 2]
+    assert view != 'not a sequence of indexes'
@@ -1,8 +1,8 @@
-from typing import List, Awaitable, Any, Union
-from asyncio import Future, isfuture, sleep, CancelledError
+from typing import List, Dict, Awaitable, Any, Union
+from asyncio import Future, isfuture, sleep, gather, CancelledError
 from pytest import fixture, raises
 from integrark.core import (
-    DataLoader, StandardDataLoader)
+    DataLoader, StandardDataLoader, LruCache)
 
 
 def test_dataloader_methods():
@@ -205,3 +205,246 @@ async def test_dataloader_fetch_returns_none():
         "<ids>: ['1', '2'] <values>: []")
     assert len(dataloader.queue) == 0
     assert len(dataloader.cache) == 0
+
+
+async def test_dataloader_max_batch_size():
+    batches = []
+
+    async def batch_fetch(ids: List[str]) -> List[Any]:
+        batches.append(ids)
+        return [f'Response: {id}' for id in ids]
+
+    dataloader = StandardDataLoader(batch_fetch, max_batch_size=2)
+
+    future_list = dataloader.load_many(['1', '2', '3', '4', '5'])
+
+    await sleep(0.01)
+
+    assert batches == [['1', '2'], ['3', '4'], ['5']]
+    assert await future_list == [
+        'Response: 1', 'Response: 2', 'Response: 3',
+        'Response: 4', 'Response: 5']
+
+
+async def test_dataloader_max_concurrency():
+    running = 0
+    peak = 0
+
+    async def slow_fetch(ids: List[str]) -> List[Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await sleep(0.01)
+        running -= 1
+        return ids
+
+    dataloader = StandardDataLoader(
+        slow_fetch, max_batch_size=1, max_concurrency=2)
+
+    result = await dataloader.load_many(['1', '2', '3', '4', '5'])
+
+    assert result == ['1', '2', '3', '4', '5']
+    assert peak == 2
+
+
+async def test_dataloader_max_batch_size_partial_resolution():
+    async def uneven_fetch(ids: List[str]) -> List[Any]:
+        if '1' in ids:
+            return ids
+        await sleep(0.05)
+        return ids
+
+    dataloader = StandardDataLoader(uneven_fetch, max_batch_size=1)
+
+    future_1 = dataloader.load('1')
+    future_2 = dataloader.load('2')
+
+    await sleep(0.01)
+
+    assert future_1.done() is True
+    assert future_2.done() is False
+
+    assert await future_2 == '2'
+
+
+async def test_dataloader_max_batch_size_failed_batch():
+    async def failing_fetch(ids: List[str]) -> List[Any]:
+        if '2' in ids:
+            raise ValueError('Batch failure')
+        return ids
+
+    dataloader = StandardDataLoader(failing_fetch, max_batch_size=1)
+
+    future_1 = dataloader.load('1')
+    future_2 = dataloader.load('2')
+
+    await sleep(0.01)
+
+    assert await future_1 == '1'
+    with raises(ValueError):
+        await future_2
+
+    assert list(dataloader.cache) == ['1']
+
+
+async def test_dataloader_prime():
+    fetched = []
+
+    async def fetch(ids: List[str]) -> List[Any]:
+        fetched.extend(ids)
+        return [f'Fetched: {id}' for id in ids]
+
+    dataloader = StandardDataLoader(fetch)
+
+    dataloader.prime('1', 'Primed: 1')
+    dataloader.prime('1', 'Primed again: 1')
+    dataloader.prime('2', ValueError('Primed error'))
+
+    assert await dataloader.load('1') == 'Primed: 1'
+    with raises(ValueError):
+        await dataloader.load('2')
+    assert fetched == []
+
+
+async def test_dataloader_prime_many():
+    dataloader = standard_dataloader()
+
+    dataloader.prime_many({'1': 'One', '2': 'Two'})
+
+    assert await dataloader.load_many(['1', '2']) == ['One', 'Two']
+    assert len(dataloader.queue) == 0
+
+
+async def test_dataloader_clear():
+    dataloader = standard_dataloader()
+
+    dataloader.prime_many({'1': 'One', '2': 'Two'})
+
+    dataloader.clear('1')
+    assert list(dataloader.cache) == ['2']
+    assert await dataloader.load('1') == {'id': '1', 'value': 'Response: 1'}
+
+    dataloader.clear_all()
+    assert len(dataloader.cache) == 0
+
+
+async def test_dataloader_mapping_fetch():
+    async def mapping_fetch(ids: List[str]) -> Dict[str, Any]:
+        return {id: f'Response: {id}' for id in reversed(ids) if id != '2'}
+
+    dataloader = StandardDataLoader(mapping_fetch, default='Default')
+
+    result = await dataloader.load_many(['1', '2', '3'])
+
+    assert result == ['Response: 1', 'Default', 'Response: 3']
+    assert len(dataloader.cache) == 3
+
+
+async def test_dataloader_mapping_fetch_empty():
+    async def empty_fetch(ids: List[str]) -> Dict[str, Any]:
+        return {}
+
+    dataloader = StandardDataLoader(empty_fetch)
+
+    assert await dataloader.load_many(['1', '2']) == [None, None]
+
+
+async def test_dataloader_mapping_fetch_strict():
+    async def mapping_fetch(ids: List[str]) -> Dict[str, Any]:
+        return {'1': 'Response: 1'}
+
+    dataloader = StandardDataLoader(mapping_fetch, strict=True)
+
+    future_1 = dataloader.load('1')
+    future_2 = dataloader.load('2')
+
+    assert await future_1 == 'Response: 1'
+    with raises(KeyError) as execinfo:
+        await future_2
+
+    assert 'Missing value for <id>: 2' in str(execinfo.value)
+    assert list(dataloader.cache) == ['1', '2']
+
+
+def projection_loader(calls, **options):
+    async def fetch(ids: List[str], fields=None) -> List[Any]:
+        calls.append((ids, fields and sorted(fields)))
+        return [{field: f'{id}.{field}' for field in fields or ['all']}
+                for id in ids]
+
+    return StandardDataLoader(fetch, **options)
+
+
+async def test_dataloader_projection_merges_batch_fields():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls)
+
+    result_1, result_2 = await gather(
+        dataloader.load('1', ['name']), dataloader.load('2', ['age']))
+
+    assert calls == [(['1', '2'], ['age', 'name'])]
+    assert result_1 == {'age': '1.age', 'name': '1.name'}
+
+
+async def test_dataloader_projection_reuses_covering_entries():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls)
+
+    await dataloader.load('1', ['name', 'age'])
+    await dataloader.load('1', ['name'])
+    await dataloader.load('1', ['email'])
+    await dataloader.load('1')
+    await dataloader.load('1', ['email'])
+
+    assert calls == [
+        (['1'], ['age', 'name']),
+        (['1'], ['age', 'email', 'name']),
+        (['1'], None)]
+
+
+async def test_dataloader_projection_same_id_in_batch():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls)
+
+    result_1, result_2 = await gather(
+        dataloader.load('1', ['name']), dataloader.load('1', ['age']))
+    cached = await dataloader.load('1', ['name'])
+
+    assert calls == [(['1'], ['age', 'name'])]
+    assert result_1 == result_2 == cached == {
+        'age': '1.age', 'name': '1.name'}
+    assert dataloader.projections == {'1': frozenset(['age', 'name'])}
+
+
+async def test_dataloader_projection_bounded_by_cache():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls, cache=LruCache(2))
+
+    for index in range(100):
+        await dataloader.load(str(index), ['name'])
+
+    assert len(dataloader.projections) <= 2 * len(dataloader.cache)
+    assert set(dataloader.cache) <= set(dataloader.projections)
+
+
+async def test_dataloader_projection_full_load_wins():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls)
+
+    await gather(dataloader.load('1', ['name']), dataloader.load('2'))
+
+    assert calls == [(['1', '2'], None)]
+
+
+async def test_dataloader_projection_prime():
+    calls: List[Any] = []
+    dataloader = projection_loader(calls)
+
+    dataloader.prime_many({'1': {'name': 'One'}}, ['name'])
+
+    assert await dataloader.load('1', ['name']) == {'name': 'One'}
+    assert await dataloader.load('1', ['age']) == {
+        'age': '1.age', 'name': '1.name'}
+
+    dataloader.clear_all()
+    assert dataloader.projections == {}
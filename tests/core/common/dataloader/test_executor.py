@@ -0,0 +1,146 @@
+import time
+from typing import List, Any
+from asyncio import sleep, gather, ensure_future, CancelledError
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from threading import get_ident
+from types import SimpleNamespace as SN
+from pytest import raises
+from integrark.core import StandardDataLoader, FetchExecutor, Joiner
+
+
+def blocking_fetch(ids: List[str]) -> List[Any]:
+    time.sleep(0.01)
+    return [f'Blocking: {id}' for id in ids]
+
+
+async def test_fetch_executor_run():
+    executor = FetchExecutor(ThreadPoolExecutor(2))
+
+    result = await executor.run(blocking_fetch, ['1'])
+
+    assert result == ['Blocking: 1']
+    assert executor.stats == {
+        'waiting': 0, 'running': 0, 'completed': 1,
+        'failed': 0, 'cancelled': 0}
+
+
+async def test_fetch_executor_max_concurrency():
+    executor = FetchExecutor(ThreadPoolExecutor(4), max_concurrency=1)
+    running = []
+
+    def probe(value):
+        running.append(executor.running)
+        time.sleep(0.01)
+        return value
+
+    results = await gather(*[executor.run(probe, index)
+                             for index in range(3)])
+
+    assert results == [0, 1, 2]
+    assert running == [1, 1, 1]
+
+
+async def test_fetch_executor_failure():
+    executor = FetchExecutor()
+
+    def failing(ids):
+        raise ValueError('Blocking failure')
+
+    with raises(ValueError):
+        await executor.run(failing, ['1'])
+
+    assert executor.failed == 1
+
+
+async def test_fetch_executor_cancelled_while_waiting():
+    executor = FetchExecutor(max_concurrency=1)
+    calls = []
+
+    def record(value):
+        time.sleep(0.02)
+        calls.append(value)
+
+    first = ensure_future(executor.run(record, 1))
+    second = ensure_future(executor.run(record, 2))
+    await sleep(0.005)
+    second.cancel()
+    await first
+
+    with raises(CancelledError):
+        await second
+
+    assert calls == [1]
+    assert executor.cancelled == 1
+
+
+async def test_fetch_executor_process_pool():
+    with ProcessPoolExecutor(1) as pool:
+        executor = FetchExecutor(pool)
+        result = await executor.run(blocking_fetch, ['1', '2'])
+
+    assert result == ['Blocking: 1', 'Blocking: 2']
+
+
+async def test_dataloader_sync_fetch_function():
+    threads = []
+
+    def sync_fetch(ids: List[str]) -> List[Any]:
+        threads.append(get_ident())
+        return blocking_fetch(ids)
+
+    dataloader = StandardDataLoader(
+        sync_fetch, executor=FetchExecutor(ThreadPoolExecutor(1)))
+
+    result = await dataloader.load_many(['1', '2'])
+
+    assert result == ['Blocking: 1', 'Blocking: 2']
+    assert threads and threads[0] != get_ident()
+    assert dataloader.executor.completed == 1
+
+
+async def test_dataloader_abandoned_batch_cancels_fetch():
+    fetched = []
+
+    async def slow_fetch(ids: List[str]) -> List[Any]:
+        await sleep(0.05)
+        fetched.extend(ids)
+        return ids
+
+    dataloader = StandardDataLoader(slow_fetch)
+
+    request = ensure_future(dataloader.load_many(['1', '2']))
+    await sleep(0.01)
+    request.cancel()
+    await sleep(0.06)
+
+    assert fetched == []
+    assert len(dataloader.cache) == 0
+
+
+async def test_dataloader_partially_abandoned_batch_keeps_fetching():
+    async def slow_fetch(ids: List[str]) -> List[Any]:
+        await sleep(0.02)
+        return ids
+
+    dataloader = StandardDataLoader(slow_fetch)
+
+    future_1 = dataloader.load('1')
+    future_2 = dataloader.load('2')
+    await sleep(0.005)
+    future_1.cancel()
+
+    assert await future_2 == '2'
+
+
+async def test_joiner_sync_repository():
+    class BlockingRepository:
+        def search(self, domain):
+            time.sleep(0.01)
+            return [SN(id='001', name='alpha')]
+
+    joiner = Joiner(BlockingRepository(), executor=FetchExecutor())
+
+    item = await joiner.build().load('001')
+
+    assert item.name == 'alpha'
+    assert joiner.executor.completed == 1
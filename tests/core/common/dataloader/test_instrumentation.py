@@ -0,0 +1,80 @@
+from typing import List, Any
+from integrark.core import StandardDataLoader, Instrumentation, Joiner
+from integrark.core.common.dataloader.instrumentation import Histogram
+from modelark import MemoryRepository
+
+
+def test_histogram():
+    histogram = Histogram([1, 5, 10])
+
+    for value in [1, 3, 5, 7, 50]:
+        histogram.observe(value)
+
+    assert histogram.stats == {
+        'count': 5, 'sum': 66, 'mean': 13.2,
+        'buckets': {1: 1, 5: 2, 10: 1, float('inf'): 1}}
+    assert Histogram([1]).mean == 0
+
+
+def test_instrumentation_disabled_child():
+    assert Instrumentation(enabled=False).child() is None
+
+
+def test_instrumentation_child_forwards_to_parent():
+    process = Instrumentation()
+    request = process.child()
+
+    request.record_load('Loader')
+    request.record_load('Loader', hit=True)
+    request.record_fetch('Loader', 1, 0.002)
+    process.child().record_load('Loader', deduplicated=True)
+
+    assert request.stats['Loader']['loads'] == 2
+    assert process.stats['Loader']['loads'] == 3
+    assert process.stats['Loader']['hits'] == 1
+    assert process.stats['Loader']['deduplicated'] == 1
+    assert process.stats['Loader']['batches'] == 1
+
+
+async def test_dataloader_instrumentation():
+    async def fetch(ids: List[str]) -> List[Any]:
+        return ids
+
+    instrumentation = Instrumentation()
+    dataloader = StandardDataLoader(
+        fetch, {'instrumentation': instrumentation}, name='letters')
+
+    await dataloader.load_many(['1', '2', '1'])
+    await dataloader.load('2')
+
+    stats = instrumentation.stats['letters']
+    assert stats['loads'] == 4
+    assert stats['hits'] == 1
+    assert stats['deduplicated'] == 1
+    assert stats['fetched'] == 2
+    assert stats['batches'] == 1
+    assert stats['hit_ratio'] == 0.25
+    assert stats['dedup_ratio'] == 0.25
+    assert stats['batch_size']['mean'] == 2
+    assert stats['latency']['count'] == 1
+
+
+async def test_dataloader_instrumentation_disabled():
+    async def fetch(ids: List[str]) -> List[Any]:
+        return ids
+
+    dataloader = StandardDataLoader(fetch)
+
+    assert dataloader.instrumentation is None
+    assert dataloader.label == 'StandardDataLoader'
+
+
+async def test_joiner_instrumentation_label():
+    instrumentation = Instrumentation()
+    joiner = Joiner(MemoryRepository())
+
+    dataloader = joiner.build(instrumentation=instrumentation)
+    await dataloader.load('001')
+
+    assert list(instrumentation.stats) == [
+        'MemoryRepository.many_to_one_fetch']
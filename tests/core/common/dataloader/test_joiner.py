@@ -1,14 +1,15 @@
-from typing import List, Awaitable, Any, Union
+from typing import List, Dict, Awaitable, Any, Union
 from types import SimpleNamespace as SN
-from asyncio import sleep
+from asyncio import sleep, gather
 from modelark import MemoryRepository
+from filtrark import ExpressionParser
 from pytest import fixture, raises
-from integrark.core import StandardDataLoader, Joiner
+from integrark.core import StandardDataLoader, Joiner, Page, GroupView
 
 
 @fixture
 def join_repository():
-    return MemoryRepository().load({
+    return MemoryRepository(ExpressionParser()).load({
         'default': {
             '001': SN(id='001', name='alpha', reference='x'),
             '002': SN(id='002', name='beta', reference='x'),
@@ -19,7 +20,7 @@ def join_repository():
 
 @fixture
 def link_repository():
-    return MemoryRepository().load({
+    return MemoryRepository(ExpressionParser()).load({
         'default': {
             '001': SN(id='001', color='blue', letter_id='001'),
             '002': SN(id='002', color='blue', letter_id='002'),
@@ -122,3 +123,404 @@ async def test_join_dataloader_build_many_to_many(
     assert item_1[1].name == 'beta'
     assert len(item_2) == 1
     assert item_2[0].name == 'gamma'
+
+
+async def test_join_dataloader_build_max_batch_size(join_repository):
+    joiner = Joiner(join_repository)
+
+    dataloader = joiner.build(max_batch_size=1)
+
+    assert dataloader.max_batch_size == 1
+
+    items = await dataloader.load_many(['001', '002', '003'])
+
+    assert [item.name for item in items] == ['alpha', 'beta', 'gamma']
+
+
+async def test_join_dataloader_prime(join_repository):
+    searches = []
+
+    class SpyRepository(MemoryRepository):
+        async def search(self, domain, limit=None, offset=None, order=None):
+            searches.append(domain)
+            return await super().search(domain, limit, offset, order)
+
+    repository = SpyRepository().load(join_repository.data)
+    context = {'dataloaders': {}}
+    context['dataloaders']['letters'] = Joiner(repository).build(context)
+    children_loader = Joiner(
+        repository, 'reference', prime='letters').build(context)
+
+    children = await children_loader.load('x')
+    letter = await context['dataloaders']['letters'].load('002')
+
+    assert [child.name for child in children] == ['alpha', 'beta']
+    assert letter is children[1]
+    assert searches == [[('reference', 'in', ['x'])]]
+
+
+async def test_join_dataloader_prime_missing_loader(join_repository):
+    dataloader = Joiner(join_repository, prime='letters').build()
+
+    item = await dataloader.load('001')
+
+    assert item.name == 'alpha'
+
+
+async def test_join_dataloader_build_many_to_one_missing(join_repository):
+    joiner = Joiner(join_repository)
+
+    dataloader = joiner.build()
+
+    items = await dataloader.load_many(['003', '999', '001'])
+
+    assert items[0].name == 'gamma'
+    assert items[1] is None
+    assert items[2].name == 'alpha'
+
+
+async def test_join_dataloader_many_to_many_shared_target_loader(
+        join_repository, link_repository):
+    searches = []
+
+    class SpyRepository(MemoryRepository):
+        async def search(self, domain, limit=None, offset=None, order=None):
+            searches.append(domain)
+            return await super().search(domain, limit, offset, order)
+
+    repository = SpyRepository().load(join_repository.data)
+    context: dict = {}
+
+    colors_loader = Joiner(
+        repository, 'letter_id', link_repository, 'color').build(context)
+    ids_loader = Joiner(
+        repository, 'letter_id', link_repository, 'id').build(context)
+
+    blue, first = await gather(
+        colors_loader.load('blue'), ids_loader.load('001'))
+    red = await colors_loader.load('red')
+
+    assert [item.name for item in blue] == ['alpha', 'beta']
+    assert [item.name for item in first] == ['alpha']
+    assert [item.name for item in red] == ['gamma']
+    assert len(context['dataloaders']) == 1
+    assert searches == [
+        [('id', 'in', ['001', '002'])],
+        [('id', 'in', ['003'])]]
+
+
+@fixture
+def projection_repository(join_repository):
+    class ProjectionRepository(MemoryRepository):
+        def __init__(self):
+            super().__init__()
+            self.projections = []
+
+        async def search(self, domain, limit=None, offset=None,
+                         order=None, fields=None):
+            self.projections.append(fields)
+            items = await super().search(domain, limit, offset, order)
+            return [SN(**{field: getattr(item, field)
+                          for field in fields or vars(item)})
+                    for item in items]
+
+    return ProjectionRepository().load(join_repository.data)
+
+
+async def test_join_dataloader_projection_many_to_one(
+        projection_repository):
+    dataloader = Joiner(projection_repository).build()
+
+    item = await dataloader.load('001', ['name'])
+
+    assert projection_repository.projections == [['id', 'name']]
+    assert vars(item) == {'id': '001', 'name': 'alpha'}
+
+
+async def test_join_dataloader_projection_one_to_many(
+        projection_repository):
+    dataloader = Joiner(projection_repository, 'reference').build()
+
+    items = await dataloader.load('x', ['name'])
+
+    assert projection_repository.projections == [['name', 'reference']]
+    assert [item.name for item in items] == ['alpha', 'beta']
+
+
+async def test_join_dataloader_projection_prime(projection_repository):
+    context: Dict[str, Any] = {'dataloaders': {}}
+    context['dataloaders']['letters'] = Joiner(
+        projection_repository).build(context)
+    dataloader = Joiner(
+        projection_repository, 'reference', prime='letters').build(context)
+
+    items = await dataloader.load('x', ['name'])
+    letter = await context['dataloaders']['letters'].load('002', ['name'])
+
+    assert projection_repository.projections == [['id', 'name', 'reference']]
+    assert letter is items[1]
+    assert vars(letter) == {'id': '002', 'name': 'beta', 'reference': 'x'}
+
+
+async def test_join_dataloader_projection_many_to_many(
+        projection_repository, link_repository):
+    dataloader = Joiner(projection_repository, 'letter_id',
+                        link_repository, 'color').build()
+
+    items = await dataloader.load('blue', ['name'])
+
+    assert projection_repository.projections == [['id', 'name']]
+    assert [vars(item) for item in items] == [
+        {'id': '001', 'name': 'alpha'}, {'id': '002', 'name': 'beta'}]
+
+
+async def test_join_dataloader_projection_unsupported(join_repository):
+    dataloader = Joiner(join_repository).build()
+
+    item = await dataloader.load('001', ['name'])
+
+    assert item.reference == 'x'
+
+
+async def test_join_dataloader_one_to_many_page(join_repository):
+    joiner = Joiner(join_repository, 'reference')
+
+    dataloader = joiner.build(page=Page(limit=1, order='name desc'))
+
+    items_x, items_y = await dataloader.load_many(['x', 'y'])
+
+    assert [item.name for item in items_x] == ['beta']
+    assert [item.name for item in items_y] == ['gamma']
+
+
+async def test_join_dataloader_one_to_many_page_scan(join_repository):
+    searches = []
+
+    class SpyRepository(MemoryRepository):
+        async def search(self, domain, limit=None, offset=None, order=None):
+            searches.append((limit, offset))
+            return await super().search(domain, limit, offset, order)
+
+    repository = SpyRepository().load(join_repository.data)
+    joiner = Joiner(repository, 'reference', page_size=2)
+
+    dataloader = joiner.build(page=Page(
+        limit=1, after='', order='name', connection=True))
+
+    connection = await dataloader.load('x')
+
+    assert searches == [(2, None), (2, 2)]
+    assert [edge['node'].name for edge in connection['edges']] == ['alpha']
+    assert connection['pageInfo']['hasNextPage'] is True
+
+
+async def test_join_dataloader_one_to_many_page_scan_tiebreak(
+        join_repository):
+    orders = []
+
+    class SpyRepository(MemoryRepository):
+        async def search(self, domain, limit=None, offset=None, order=None):
+            orders.append(order)
+            return await super().search(domain, limit, offset, order)
+
+    repository = SpyRepository().load(join_repository.data)
+
+    await Joiner(repository, 'reference', page_size=2).build(
+        page=Page(limit=1)).load('x')
+    await Joiner(repository, 'reference', page_size=2).build(
+        page=Page(limit=1, order='name desc')).load('x')
+    await Joiner(repository, 'reference').build(
+        page=Page(limit=1)).load('x')
+
+    assert orders == [
+        'reference, id', 'reference, id',
+        'name desc, reference, id', 'name desc, reference, id', None]
+
+
+def test_join_dataloader_page_requires_one_to_many(join_repository):
+    with raises(ValueError):
+        Joiner(join_repository).build(page=Page(limit=1))
+
+
+async def test_join_dataloader_one_to_many_compact(join_repository):
+    joiner = Joiner(join_repository, 'reference', compact=True)
+
+    dataloader = joiner.build()
+
+    items_x, items_z = await dataloader.load_many(['x', 'z'])
+
+    assert isinstance(items_x, GroupView)
+    assert [item.name for item in items_x] == ['alpha', 'beta']
+    assert items_z == []
+
+
+async def test_join_dataloader_one_to_many_compact_projection(
+        projection_repository):
+    joiner = Joiner(projection_repository, 'reference', compact=True)
+
+    items = await joiner.build().load('x', ['name'])
+
+    assert items[0].store.fields == ['name', 'reference']
+    assert vars(items[1].materialize()) == {
+        'name': 'beta', 'reference': 'x'}
+
+
+async def test_join_dataloader_many_to_many_compact(
+        join_repository, link_repository):
+    context: dict = {'dataloaders': {}}
+    context['dataloaders']['letters'] = Joiner(join_repository).build(
+        context)
+    joiner = Joiner(join_repository, 'letter_id', link_repository,
+                    'color', prime='letters', compact=True)
+
+    blue, red = await joiner.build(context).load_many(['blue', 'red'])
+
+    assert [item.name for item in blue] == ['alpha', 'beta']
+    assert [item.name for item in red] == ['gamma']
+    assert 'gamma' == (
+        await context['dataloaders']['letters'].load('003')).name
+
+
+@fixture
+def tenant_repository():
+    return MemoryRepository().load({
+        'default': {
+            '1': SN(id='1', tenant_id='T1', code='A', name='alpha'),
+            '2': SN(id='2', tenant_id='T1', code='B', name='beta'),
+            '3': SN(id='3', tenant_id='T2', code='A', name='gamma'),
+        }
+    })
+
+
+@fixture
+def tenant_child_repository():
+    return MemoryRepository().load({
+        'default': {
+            '1': SN(id='1', tenant_id='T1', parent_code='A', name='one'),
+            '2': SN(id='2', tenant_id='T2', parent_code='B', name='two'),
+            '3': SN(id='3', tenant_id='T2', parent_code='A', name='three'),
+        }
+    })
+
+
+@fixture
+def tenant_link_repository():
+    return MemoryRepository().load({
+        'default': {
+            '1': SN(id='1', tenant_id='T1', group='G',
+                    item_tenant='T1', item_code='B'),
+            '2': SN(id='2', tenant_id='T1', group='G',
+                    item_tenant='T2', item_code='A'),
+            '3': SN(id='3', tenant_id='T2', group='G',
+                    item_tenant='T1', item_code='A'),
+        }
+    })
+
+
+async def test_join_dataloader_composite_many_to_one(tenant_repository):
+    joiner = Joiner(tenant_repository, source=('tenant_id', 'code'))
+
+    items = await joiner.build().load_many(
+        [('T1', 'A'), ('T2', 'A'), ('T2', 'B')])
+
+    assert [item and item.name for item in items] == [
+        'alpha', 'gamma', None]
+
+
+async def test_join_dataloader_composite_one_to_many(
+        tenant_child_repository):
+    joiner = Joiner(tenant_child_repository, ('tenant_id', 'parent_code'))
+
+    children = await joiner.build().load_many(
+        [('T1', 'A'), ('T2', 'A'), ('T1', 'B')])
+
+    assert [[child.name for child in items] for items in children] == [
+        ['one'], ['three'], []]
+
+
+async def test_join_dataloader_composite_one_to_many_compact(
+        tenant_child_repository):
+    joiner = Joiner(tenant_child_repository, ('tenant_id', 'parent_code'),
+                    compact=True)
+
+    children = await joiner.build().load_many([('T2', 'A'), ('T1', 'B')])
+
+    assert [[child.name for child in items] for items in children] == [
+        ['three'], []]
+
+
+async def test_join_dataloader_composite_many_to_many(
+        tenant_repository, tenant_link_repository):
+    for compact in [False, True]:
+        joiner = Joiner(
+            tenant_repository, ('item_tenant', 'item_code'),
+            tenant_link_repository, ('tenant_id', 'group'),
+            key=('tenant_id', 'code'), compact=compact)
+
+        context: dict = {}
+        group_t1, group_t2 = await joiner.build(context).load_many(
+            [('T1', 'G'), ('T2', 'G')])
+
+        assert [item.name for item in group_t1] == ['beta', 'gamma']
+        assert [item.name for item in group_t2] == ['alpha']
+
+
+@fixture
+def enforcer():
+    class MockEnforcer:
+        def __init__(self):
+            self.calls = []
+
+        async def secure(self, resource, context):
+            self.calls.append((resource, context['user']['id']))
+            await sleep(0)
+            return [('reference', '=', 'x')]
+
+    return MockEnforcer()
+
+
+async def test_join_dataloader_secure_many_to_one(join_repository, enforcer):
+    context = {'user': {'id': '007', 'roles': []}}
+    joiner = Joiner(join_repository, enforcer=enforcer, resource='letter')
+    loaders = [joiner.build(context), joiner.build(context)]
+
+    items, other = await gather(
+        loaders[0].load_many(['001', '003']), loaders[1].load('002'))
+
+    assert [item and item.name for item in items] == ['alpha', None]
+    assert other.name == 'beta'
+    assert enforcer.calls == [('letter', '007')]
+
+
+async def test_join_dataloader_secure_one_to_many(join_repository, enforcer):
+    context = {'user': {'id': '007', 'roles': []}}
+    joiner = Joiner(join_repository, 'id', enforcer=enforcer,
+                    resource='letter')
+
+    items = await joiner.build(context).load_many(['001', '003'])
+    page = await joiner.build(context, Page(limit=1)).load('003')
+
+    assert [[item.name for item in group] for group in items] == [
+        ['alpha'], []]
+    assert page == []
+    assert enforcer.calls == [('letter', '007')]
+
+
+async def test_join_dataloader_secure_many_to_many(
+        join_repository, link_repository, enforcer):
+    context = {'user': {'id': '007', 'roles': []}}
+    joiner = Joiner(join_repository, 'letter_id', link_repository, 'color',
+                    enforcer=enforcer, resource='letter')
+
+    blue, red = await joiner.build(context).load_many(['blue', 'red'])
+
+    assert [item.name for item in blue] == ['alpha', 'beta']
+    assert red == [[]]
+    assert enforcer.calls == [('letter', '007')]
+
+
+def test_join_dataloader_secure_shared_cache(join_repository, enforcer):
+    joiner = Joiner(join_repository, enforcer=enforcer, resource='letter')
+
+    with raises(ValueError):
+        joiner.build({}, name='letters')
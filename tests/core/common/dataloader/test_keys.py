@@ -0,0 +1,22 @@
+from types import SimpleNamespace as SN
+from integrark.core.common.dataloader.keys import (
+    key_of, key_fields, key_domain)
+
+
+def test_key_of():
+    item = SN(tenant_id='T1', code='C1')
+
+    assert key_of(item, 'code') == 'C1'
+    assert key_of(item, ('tenant_id', 'code')) == ('T1', 'C1')
+
+
+def test_key_fields():
+    assert key_fields('id') == ('id',)
+    assert key_fields(('tenant_id', 'code')) == ('tenant_id', 'code')
+
+
+def test_key_domain():
+    assert key_domain('id', ['1', '2']) == [('id', 'in', ['1', '2'])]
+    assert key_domain(('tenant_id', 'code'), [
+        ('T1', 'C1'), ('T1', 'C2'), ('T2', 'C1')]) == [
+        ('tenant_id', 'in', ['T1', 'T2']), ('code', 'in', ['C1', 'C2'])]
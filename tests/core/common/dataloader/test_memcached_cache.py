@@ -0,0 +1,176 @@
+from typing import List, Dict, Any
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace as SN
+from aiomcache import ClientException
+from msgpack import unpackb
+from pytest import fixture
+from integrark.core import StandardDataLoader, SharedCache, MemcachedCache
+
+
+class MockMemcachedClient:
+    def __init__(self) -> None:
+        self.data: Dict[bytes, bytes] = {}
+        self.calls: List[str] = []
+
+    async def get(self, key, default=None):
+        self.calls.append('get')
+        return self.data.get(key, default)
+
+    async def multi_get(self, *keys):
+        self.calls.append('multi_get')
+        return tuple(self.data.get(key) for key in keys)
+
+    async def set(self, key, value, exptime=0):
+        self.calls.append('set')
+        self.data[key] = value
+        return True
+
+    async def add(self, key, value, exptime=0):
+        self.calls.append('add')
+        return self.data.setdefault(key, value) is value
+
+    async def delete(self, key):
+        self.calls.append('delete')
+        return self.data.pop(key, None) is not None
+
+    async def incr(self, key, increment=1):
+        self.calls.append('incr')
+        if key not in self.data:
+            raise ClientException('Memcached incr command failed',
+                                  b'NOT_FOUND')
+        value = int(self.data[key]) + increment
+        self.data[key] = str(value).encode()
+        return value
+
+
+class MockClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@fixture
+def client():
+    return MockMemcachedClient()
+
+
+@fixture
+def memcached_cache(client):
+    return MemcachedCache(client, clock=MockClock())
+
+
+def test_memcached_cache_instantiation(memcached_cache):
+    assert isinstance(memcached_cache, SharedCache)
+
+
+async def test_memcached_cache_get_and_set_many(memcached_cache, client):
+    await memcached_cache.set_many('country', {
+        'CO': {'name': 'Colombia'}, 'ES': SN(name='España')})
+
+    result = await memcached_cache.get_many('country', ['CO', 'ES', 'MX'])
+
+    assert result == {'CO': {'name': 'Colombia'}, 'ES': {'name': 'España'}}
+    assert b'integrark:country:0:CO' in client.data
+    assert memcached_cache.stats == {'hits': 2, 'misses': 1}
+
+
+async def test_memcached_cache_custom_loads(client):
+    memcached_cache = MemcachedCache(
+        client, loads=lambda data: SN(**unpackb(data)))
+
+    await memcached_cache.set_many('country', {'CO': SN(name='Colombia')})
+    result = await memcached_cache.get_many('country', ['CO'])
+
+    assert result['CO'].name == 'Colombia'
+
+
+async def test_memcached_cache_long_keys(memcached_cache, client):
+    long_id = 'x' * 300
+
+    await memcached_cache.set_many('country', {long_id: 1, 'A B': 2})
+
+    assert all(len(key) <= 250 and b' ' not in key for key in client.data)
+    assert await memcached_cache.get_many('country', [long_id, 'A B']) == {
+        long_id: 1, 'A B': 2}
+
+
+async def test_memcached_cache_invalidate_ids(memcached_cache):
+    await memcached_cache.set_many('country', {'CO': 1, 'ES': 2})
+
+    await memcached_cache.invalidate('country', ['CO'])
+
+    assert await memcached_cache.get_many('country', ['CO', 'ES']) == {
+        'ES': 2}
+
+
+async def test_memcached_cache_invalidate_name(memcached_cache, client):
+    await memcached_cache.set_many('country', {'CO': 1})
+
+    await memcached_cache.invalidate('country')
+    assert await memcached_cache.get_many('country', ['CO']) == {}
+
+    await memcached_cache.set_many('country', {'CO': 3})
+    await memcached_cache.invalidate('country')
+
+    assert client.data[b'integrark:country:generation'] == b'2'
+    assert await memcached_cache.get_many('country', ['CO']) == {}
+
+
+async def test_dataloader_memcached_cache_round_trips(
+        memcached_cache, client):
+    fetched = []
+
+    async def fetch(ids: List[str]) -> List[Any]:
+        fetched.append(ids)
+        return [f'Value: {id}' for id in ids]
+
+    await StandardDataLoader(
+        fetch, name='country', shared_cache=memcached_cache
+    ).load_many(['CO', 'ES'])
+
+    client.calls.clear()
+    result = await StandardDataLoader(
+        fetch, name='country', shared_cache=memcached_cache
+    ).load_many(['CO', 'ES', 'MX'])
+
+    assert result == ['Value: CO', 'Value: ES', 'Value: MX']
+    assert fetched == [['CO', 'ES'], ['MX']]
+    assert client.calls == ['multi_get', 'set']
+
+
+async def test_memcached_cache_common_types(memcached_cache):
+    await memcached_cache.set_many('order', {'1': SN(
+        created_at=datetime(2020, 1, 2, 3, 4), total=Decimal('1.50'))})
+
+    assert await memcached_cache.get_many('order', ['1']) == {'1': {
+        'created_at': '2020-01-02T03:04:00', 'total': '1.50'}}
+
+
+async def test_memcached_cache_unserializable_values(memcached_cache):
+    await memcached_cache.set_many('order', {
+        '1': SN(handle=object()), '2': SN(name='valid')})
+
+    assert await memcached_cache.get_many('order', ['1', '2']) == {
+        '2': {'name': 'valid'}}
+    assert memcached_cache.stats == {'hits': 1, 'misses': 1}
+
+
+async def test_dataloader_memcached_cache_unavailable(client):
+    async def unavailable(*args, **kwargs):
+        raise ConnectionRefusedError('Connection refused')
+
+    client.get = client.multi_get = client.set = unavailable
+    memcached_cache = MemcachedCache(client, clock=MockClock())
+
+    async def fetch(ids: List[str]) -> List[Any]:
+        return [SN(id=id) for id in ids]
+
+    result = await StandardDataLoader(
+        fetch, name='order', shared_cache=memcached_cache
+    ).load_many(['1', '2'])
+
+    assert [item.id for item in result] == ['1', '2']
+    assert memcached_cache.stats == {'hits': 0, 'misses': 2}
@@ -0,0 +1,108 @@
+from types import SimpleNamespace as SN
+from integrark.core import Page
+from integrark.core.common.dataloader.pagination import (
+    GroupCollector, encode_cursor, decode_cursor, parse_order)
+
+
+def test_page_defaults():
+    page = Page()
+
+    assert page.start == 0
+    assert page.size is None
+
+
+def test_page_start_and_size():
+    assert Page(limit=2, offset=3).start == 3
+    assert Page(limit=2, offset=3).size == 6
+    assert Page(limit=2, after=encode_cursor(4)).start == 5
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(7)) == 7
+
+
+def test_parse_order():
+    assert parse_order('name desc, age,score ASC') == [
+        ('name', True), ('age', False), ('score', False)]
+
+
+def items():
+    return [
+        SN(id='1', parent='A', score=3, name='c'),
+        SN(id='2', parent='A', score=9, name='a'),
+        SN(id='3', parent='B', score=5, name='b'),
+        SN(id='4', parent='A', score=1, name='d'),
+        SN(id='5', parent='A', score=9, name='b'),
+        SN(id='6', parent='A', score=7, name='e'),
+    ]
+
+
+def test_group_collector_bounded_groups():
+    collector = GroupCollector('parent', Page(limit=2, order='score desc'))
+
+    for item in items():
+        collector.add(item)
+
+    assert len(collector.groups['A']) == 3
+    assert [item.id for item in collector.result('A')] == ['2', '5']
+    assert [item.id for item in collector.result('B')] == ['3']
+    assert collector.result('Z') == []
+
+
+def test_group_collector_multiple_order_fields():
+    collector = GroupCollector(
+        'parent', Page(limit=3, order='score desc, name'))
+
+    for item in items():
+        collector.add(item)
+
+    assert [item.id for item in collector.result('A')] == ['2', '5', '6']
+
+
+def test_group_collector_null_order_values():
+    nullable = [SN(id='1', parent='A', rank=2),
+                SN(id='2', parent='A', rank=None),
+                SN(id='3', parent='A', rank=1)]
+
+    ascending = GroupCollector('parent', Page(limit=3, order='rank'))
+    descending = GroupCollector('parent', Page(limit=3, order='rank desc'))
+    for item in nullable:
+        ascending.add(item)
+        descending.add(item)
+
+    assert [item.id for item in ascending.result('A')] == ['3', '1', '2']
+    assert [item.id for item in descending.result('A')] == ['2', '1', '3']
+
+
+def test_group_collector_unordered_offset():
+    collector = GroupCollector('parent', Page(limit=2, offset=1))
+
+    for item in items():
+        collector.add(item)
+
+    assert [item.id for item in collector.result('A')] == ['2', '4']
+
+
+def test_group_collector_connection():
+    collector = GroupCollector('parent', Page(
+        limit=2, offset=1, order='score', connection=True))
+
+    for item in items():
+        collector.add(item)
+
+    connection = collector.result('A')
+
+    assert [edge['node'].id for edge in connection['edges']] == ['1', '6']
+    assert [edge['cursor'] for edge in connection['edges']] == [
+        encode_cursor(1), encode_cursor(2)]
+    assert connection['pageInfo'] == {
+        'hasPreviousPage': True,
+        'hasNextPage': True,
+        'startCursor': encode_cursor(1),
+        'endCursor': encode_cursor(2)
+    }
+
+    empty = collector.result('Z')
+    assert empty['edges'] == []
+    assert empty['pageInfo']['startCursor'] is None
+    assert empty['pageInfo']['hasNextPage'] is False
@@ -0,0 +1,106 @@
+from typing import List, Any
+from asyncio import sleep
+from integrark.core import (
+    StandardDataLoader, TickScheduler, WindowScheduler, AdaptiveScheduler)
+
+
+def test_tick_scheduler():
+    scheduler = TickScheduler()
+
+    assert scheduler.threshold == 0
+    assert scheduler.delay() == 0
+    assert scheduler.observe(1, 0.1) is None
+
+
+def test_window_scheduler():
+    scheduler = WindowScheduler(window=2500, threshold=10)
+
+    assert scheduler.threshold == 10
+    assert scheduler.delay() == 0.0025
+
+
+def test_adaptive_scheduler_grows_with_latency():
+    scheduler = AdaptiveScheduler(
+        window=100, factor=0.5, smoothing=1, max_window=3000)
+
+    scheduler.observe(5, 0.004)
+    assert scheduler.window == 2000
+
+    scheduler.observe(5, 0.01)
+    assert scheduler.window == 3000
+
+
+def test_adaptive_scheduler_shrinks_on_single_loads():
+    scheduler = AdaptiveScheduler(window=1000, min_window=200)
+
+    scheduler.observe(1, 0.01)
+    assert scheduler.window == 500
+
+    scheduler.observe(1, 0.01)
+    scheduler.observe(1, 0.01)
+    assert scheduler.window == 200
+
+
+def test_adaptive_scheduler_full_batches_do_not_grow():
+    scheduler = AdaptiveScheduler(
+        window=100, threshold=5, factor=0.5, smoothing=1)
+
+    scheduler.observe(5, 0.004)
+
+    assert scheduler.fill == 1
+    assert scheduler.window == 100
+
+
+def batch_loader(batches, scheduler):
+    async def fetch(ids: List[str]) -> List[Any]:
+        batches.append(ids)
+        return ids
+
+    return StandardDataLoader(fetch, scheduler=scheduler)
+
+
+async def test_dataloader_window_scheduler_coalesces_loads():
+    batches: List[List[str]] = []
+    dataloader = batch_loader(batches, WindowScheduler(window=20_000))
+
+    async def deferred_load(id):
+        await sleep(0.001)
+        return await dataloader.load(id)
+
+    future_1 = dataloader.load('1')
+    result_2 = await deferred_load('2')
+
+    assert await future_1 == '1'
+    assert result_2 == '2'
+    assert batches == [['1', '2']]
+
+
+async def test_dataloader_tick_scheduler_splits_deferred_loads():
+    batches: List[List[str]] = []
+    dataloader = batch_loader(batches, TickScheduler())
+
+    async def deferred_load(id):
+        await sleep(0.001)
+        return await dataloader.load(id)
+
+    future_1 = dataloader.load('1')
+    await deferred_load('2')
+    await future_1
+
+    assert batches == [['1'], ['2']]
+
+
+async def test_dataloader_window_scheduler_threshold():
+    batches: List[List[str]] = []
+    dataloader = batch_loader(
+        batches, WindowScheduler(window=1_000_000, threshold=2))
+
+    future_list = dataloader.load_many(['1', '2', '3'])
+
+    assert len(dataloader.queue) == 1
+
+    dataloader.load('4')
+    await sleep(0.01)
+
+    assert batches == [['1', '2'], ['3', '4']]
+    assert await future_list == ['1', '2', '3']
@@ -0,0 +1,108 @@
+from typing import List, Any
+from pytest import fixture
+from integrark.core import StandardDataLoader, SharedCache
+
+
+class MockClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@fixture
+def clock():
+    return MockClock()
+
+
+@fixture
+def shared_cache(clock):
+    return SharedCache(ttl=60, clock=clock)
+
+
+async def test_shared_cache_get_and_set_many(shared_cache):
+    await shared_cache.set_many('country', {'CO': 'Colombia'})
+
+    result = await shared_cache.get_many('country', ['CO', 'ES'])
+
+    assert result == {'CO': 'Colombia'}
+    assert await shared_cache.get_many('city', ['CO']) == {}
+    assert shared_cache.stats['country'] == {
+        'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+
+
+async def test_shared_cache_ttl(shared_cache, clock):
+    await shared_cache.set_many('country', {'CO': 'Colombia'})
+
+    clock.now = 61
+
+    assert await shared_cache.get_many('country', ['CO']) == {}
+
+
+async def test_shared_cache_max_entries(clock):
+    shared_cache = SharedCache(ttl=60, clock=clock, max_entries=2)
+
+    await shared_cache.set_many('country', {
+        'CO': 'Colombia', 'ES': 'España', 'MX': 'México'})
+
+    assert await shared_cache.get_many('country', ['CO', 'ES', 'MX']) == {
+        'ES': 'España', 'MX': 'México'}
+    assert shared_cache.stats['country']['evictions'] == 1
+
+
+async def test_shared_cache_invalidate(shared_cache):
+    await shared_cache.set_many('country', {
+        'CO': 'Colombia', 'ES': 'España', 'MX': 'México'})
+
+    await shared_cache.invalidate('country', ['CO'])
+    assert await shared_cache.get_many('country', ['CO', 'ES']) == {
+        'ES': 'España'}
+
+    await shared_cache.invalidate('country')
+    assert await shared_cache.get_many('country', ['ES', 'MX']) == {}
+
+
+def fetch_loader(fetched, **options):
+    async def fetch(ids: List[str]) -> List[Any]:
+        fetched.append(ids)
+        return [f'Value: {id}' for id in ids]
+
+    return StandardDataLoader(fetch, **options)
+
+
+async def test_dataloader_shared_cache_across_loaders(shared_cache):
+    fetched: List[List[str]] = []
+
+    first_loader = fetch_loader(
+        fetched, name='country', shared_cache=shared_cache)
+    assert await first_loader.load_many(['CO', 'ES']) == [
+        'Value: CO', 'Value: ES']
+
+    second_loader = fetch_loader(
+        fetched, context={'shared_cache': shared_cache}, name='country')
+    assert await second_loader.load_many(['ES', 'MX']) == [
+        'Value: ES', 'Value: MX']
+
+    assert fetched == [['CO', 'ES'], ['MX']]
+
+
+async def test_dataloader_shared_cache_requires_name(shared_cache):
+    fetched: List[List[str]] = []
+
+    dataloader = fetch_loader(
+        fetched, context={'shared_cache': shared_cache})
+
+    assert dataloader.shared_cache is None
+
+
+async def test_dataloader_shared_cache_invalidation(shared_cache):
+    fetched: List[List[str]] = []
+
+    await fetch_loader(
+        fetched, name='country', shared_cache=shared_cache).load('CO')
+    await shared_cache.invalidate('country', ['CO'])
+    await fetch_loader(
+        fetched, name='country', shared_cache=shared_cache).load('CO')
+
+    assert fetched == [['CO'], ['CO']]
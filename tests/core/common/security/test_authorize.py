@@ -0,0 +1,44 @@
+from types import SimpleNamespace as SN
+from pytest import raises
+from integrark.core.common.security import authorize, AuthorizationError
+
+
+class MockEnforcer:
+    def __init__(self):
+        self.calls = []
+
+    async def check_many(self, pairs, context):
+        self.calls.append(list(pairs))
+        return [operation in 'r' for _, operation in pairs]
+
+
+class MockSolution:
+    def __init__(self):
+        self.enforcer = MockEnforcer()
+
+    @authorize(('order', 'r'), ('item', 'r'))
+    async def resolve__orders(self, parent, info, limit=None):
+        return ['O001'][:limit]
+
+    @authorize(('order', 'r'), ('order', 'd'))
+    async def resolve__delete(self, parent, info):
+        return True
+
+
+async def test_authorize_allowed():
+    solution = MockSolution()
+    info = SN(context={'user': {'id': '007', 'roles': ['clerk|abc123']}})
+
+    result = await solution.resolve__orders(None, info, limit=1)
+
+    assert result == ['O001']
+    assert solution.enforcer.calls == [[('order', 'r'), ('item', 'r')]]
+    assert solution.resolve__orders.__name__ == 'resolve__orders'
+
+
+async def test_authorize_denied():
+    solution = MockSolution()
+    info = SN(context={'user': {'id': '007', 'roles': ['clerk|abc123']}})
+
+    with raises(AuthorizationError, match='<d> for <order>'):
+        await solution.resolve__delete(None, info)
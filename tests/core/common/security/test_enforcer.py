@@ -1,8 +1,10 @@
+from asyncio import sleep, gather
 from pytest import fixture, raises
 from types import SimpleNamespace as SN
 from modelark import Repository, MemoryRepository
 from integrark.core.common.security import (
     Enforcer, AuthorizationError)
+from integrark.core.common.dataloader import Instrumentation
 
 
 @fixture
@@ -113,3 +115,207 @@ async def test_enforcer_secure(resolver):
     domain = await enforcer.secure('order', context)
 
     assert domain == [["location_id", "in", ["L001", "L003"]]]
+
+
+async def test_enforcer_policy_index(resolver, policy_repository):
+    enforcer = Enforcer(resolver)
+    await enforcer.preload()
+
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+    policy_repository.data['default']['P001'] = SN(
+        id='P001', role_id='abc123', resource='order', privilege='r')
+
+    await enforcer.check('order', 'c', context)
+
+    enforcer.invalidate('order')
+    with raises(AuthorizationError):
+        await enforcer.check('order', 'c', context)
+
+
+@fixture
+def group_resolver(location_repository):
+    class SlowLocationRepository:
+        running = 0
+        peak = 0
+
+        async def search(self, domain):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await sleep(0.01)
+            self.running -= 1
+            return await location_repository.search(domain)
+
+    class MockResolver:
+        repositories = {
+            'policy': MemoryRepository().load({'default': {
+                'P001': SN(id='P001', role_id='abc123',
+                           resource='order', privilege='r'),
+                'P002': SN(id='P002', role_id='abc123',
+                           resource='order', privilege='r')}}),
+            'restriction': MemoryRepository().load({'default': {
+                'R001': SN(id='R001', policy_id='P002', sequence=0,
+                           target='location',
+                           domain='[["country", "=", "España"]]'),
+                'R002': SN(id='R002', policy_id='P001', sequence=0,
+                           target='location',
+                           domain='[["country", "=", "Colombia"]]'),
+                'R003': SN(id='R003', policy_id='P002', sequence=1,
+                           domain=('[["source_id", "in", '
+                                   '[item.id for item in previous]]]')),
+                'R004': SN(id='R004', policy_id='P001', sequence=1,
+                           domain=('[["location_id", "in", '
+                                   '[item.id for item in previous]]]'))}}),
+            'location': SlowLocationRepository()
+        }
+
+        def resolve(self, target: str) -> Repository:
+            return self.repositories[target]
+
+    return MockResolver()
+
+
+async def test_enforcer_secure_concurrent_groups(group_resolver):
+    instrumentation = Instrumentation()
+    enforcer = Enforcer(group_resolver, instrumentation=instrumentation)
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    domain = await enforcer.secure('order', context)
+
+    assert domain == [["source_id", "in", ["L002"]],
+                      ["location_id", "in", ["L001", "L003"]]]
+    assert group_resolver.resolve('location').peak == 2
+    assert 'previous' not in context
+    assert set(instrumentation.stats) == {'enforcer:P001', 'enforcer:P002'}
+    assert instrumentation.stats['enforcer:P001']['latency']['sum'] > 0
+
+
+async def test_enforcer_secure_max_concurrency(group_resolver):
+    enforcer = Enforcer(group_resolver, max_concurrency=1)
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    domain = await enforcer.secure('order', context)
+
+    assert len(domain) == 2
+    assert group_resolver.resolve('location').peak == 1
+
+
+async def test_enforcer_check_many(resolver, policy_repository):
+    enforcer = Enforcer(resolver)
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    decisions = await enforcer.check_many(
+        [('order', 'r'), ('order', 'd'), ('location', 'r')], context)
+
+    assert decisions == [True, False, False]
+    assert enforcer.policies.stats['misses'] == 2
+
+
+async def test_enforcer_secure_many(resolver):
+    enforcer = Enforcer(resolver)
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    domains = await enforcer.secure_many(['order', 'location'], context)
+
+    assert domains == [[["location_id", "in", ["L001", "L003"]]], []]
+
+
+async def test_enforcer_decision_cache(
+        resolver, policy_repository, restriction_repository):
+    del restriction_repository.data['default']['R001']
+    restriction_repository.data['default']['R002'] = SN(
+        id='R002', policy_id='P001', sequence=1, target='order',
+        domain='[["location_id", "in", ["L001", "L003"]]]')
+    enforcer = Enforcer(resolver)
+    clerk = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+    other = {'user': {'id': '008', 'roles': ['seller|abc123']}}
+
+    await enforcer.check('order', 'r', clerk)
+    await enforcer.check('order', 'r', other)
+    first = await enforcer.secure('order', clerk)
+    second = await enforcer.secure('order', other)
+
+    assert first == second == [["location_id", "in", ["L001", "L003"]]]
+    assert enforcer.decisions.stats['hits'] == 2
+
+    policy_repository.data['default']['P001'] = SN(
+        id='P001', role_id='abc123', resource='order', privilege='c')
+    enforcer.invalidate(role_id='abc123')
+
+    assert len(enforcer.decisions) == 0
+    with raises(AuthorizationError):
+        await enforcer.check('order', 'r', clerk)
+
+
+async def test_enforcer_decision_cache_recency(resolver):
+    enforcer = Enforcer(resolver, max_decisions=2)
+    clerk = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    for index in range(5):
+        await enforcer.check('order', 'r', clerk)
+        await enforcer.check_many([('order', 'r')], {'user': {
+            'id': '008', 'roles': [f'guest|{index}']}})
+
+    assert ('check', frozenset(['abc123']), 'order', 'r') in (
+        enforcer.decisions)
+    assert enforcer.decisions.stats['hits'] == 4
+
+
+async def test_enforcer_decision_cache_chained(
+        resolver, location_repository):
+    enforcer = Enforcer(resolver)
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']}}
+
+    first = await enforcer.secure('order', context)
+    location_repository.data['default']['L002'].country = 'Colombia'
+    second = await enforcer.secure('order', context)
+
+    assert first == [["location_id", "in", ["L001", "L003"]]]
+    assert second == [["location_id", "in", ["L001", "L002", "L003"]]]
+    assert len(enforcer.decisions) == 0
+
+
+async def test_enforcer_decision_cache_personal(
+        resolver, restriction_repository):
+    enforcer = Enforcer(resolver)
+    restriction_repository.data['default']['R002'] = SN(
+        id='R002', policy_id='P001', sequence=1, target='order',
+        domain='[["user_id", "=", user["id"]]]')
+
+    first = await enforcer.secure(
+        'order', {'user': {'id': '007', 'roles': ['clerk|abc123']}})
+    second = await enforcer.secure(
+        'order', {'user': {'id': '008', 'roles': ['clerk|abc123']}})
+
+    assert first == [["user_id", "=", "007"]]
+    assert second == [["user_id", "=", "008"]]
+
+
+async def test_enforcer_restriction_memo(
+        resolver, location_repository, restriction_repository):
+    restriction_repository.data['default']['R002'] = SN(
+        id='R002', policy_id='P001', sequence=1, target='order',
+        domain=('[["location_id", "in", [item.id for item in previous]], '
+                '["user_id", "=", user["id"]]]'))
+    searches = []
+    search = location_repository.search
+
+    async def counted_search(domain):
+        searches.append(domain)
+        return await search(domain)
+
+    location_repository.search = counted_search
+    enforcer = Enforcer(resolver)
+    memo: dict = {}
+    context = {'user': {'id': '007', 'roles': ['clerk|abc123']},
+               'memo': memo}
+
+    first, second = await gather(
+        enforcer.secure('order', context), enforcer.secure('order', context))
+
+    assert first == second == [["location_id", "in", ["L001", "L003"]],
+                               ["user_id", "=", "007"]]
+    assert len(searches) == 1
+    assert list(memo) == [('R001', '[["country", "=", "Colombia"]]')]
+
+    await enforcer.secure('order', {**context, 'memo': {}})
+    assert len(searches) == 2
@@ -0,0 +1,96 @@
+from pytest import fixture
+from types import SimpleNamespace as SN
+from modelark import MemoryRepository
+from filtrark import ExpressionParser
+from integrark.core.common.security import PolicyIndex
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@fixture
+def policy_repository():
+    class MockPolicyRepository(MemoryRepository):
+        searches = 0
+
+        async def search(self, domain, *args, **kwargs):
+            self.searches += 1
+            return await super().search(domain, *args, **kwargs)
+
+    return MockPolicyRepository(ExpressionParser()).load({
+        'default': {
+            'P001': SN(id='P001', role_id='R1', resource='order',
+                       privilege='cr'),
+            'P002': SN(id='P002', role_id='R2', resource='order',
+                       privilege='d'),
+            'P003': SN(id='P003', role_id='R1', resource='item',
+                       privilege='r')
+        }
+    })
+
+
+async def test_policy_index_get(policy_repository):
+    index = PolicyIndex(policy_repository)
+
+    policies = await index.get('order', ['R2', 'R1', 'R3'])
+    again = await index.get('order', ['R1', 'R3'])
+
+    assert [policy.id for policy in policies] == ['P002', 'P001']
+    assert [policy.id for policy in again] == ['P001']
+    assert policy_repository.searches == 1
+    assert index.stats == {'hits': 2, 'misses': 3, 'size': 3}
+
+
+async def test_policy_index_ttl(policy_repository):
+    clock = Clock()
+    index = PolicyIndex(policy_repository, ttl=10, clock=clock)
+
+    await index.get('order', ['R1'])
+    clock.now = 5
+    await index.get('order', ['R1'])
+    clock.now = 11
+    await index.get('order', ['R1'])
+
+    assert policy_repository.searches == 2
+
+
+async def test_policy_index_preload(policy_repository):
+    clock = Clock()
+    index = PolicyIndex(policy_repository, ttl=10, clock=clock)
+
+    await index.preload()
+    item = await index.get('item', ['R1', 'R2'])
+    unknown = await index.get('customer', ['R1'])
+
+    assert [policy.id for policy in item] == ['P003']
+    assert unknown == []
+    assert policy_repository.searches == 1
+
+    clock.now = 11
+    await index.get('customer', ['R1'])
+    assert policy_repository.searches == 2
+
+
+async def test_policy_index_invalidate(policy_repository):
+    index = PolicyIndex(policy_repository)
+    await index.preload()
+
+    policy_repository.data['default']['P002'] = SN(
+        id='P002', role_id='R2', resource='order', privilege='u')
+    index.invalidate('order', 'R2')
+    order = await index.get('order', ['R1', 'R2'])
+    item = await index.get('item', ['R1'])
+
+    assert [policy.privilege for policy in order] == ['cr', 'u']
+    assert [policy.id for policy in item] == ['P003']
+    assert policy_repository.searches == 2
+
+    index.invalidate()
+    assert index.entries == {}
+    await index.get('item', ['R1'])
+    assert policy_repository.searches == 3
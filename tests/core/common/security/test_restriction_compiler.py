@@ -0,0 +1,70 @@
+from types import SimpleNamespace as SN
+from filtrark import SafeEval
+from integrark.core.common.security import RestrictionCompiler
+
+
+def test_restriction_compiler_evaluate():
+    compiler = RestrictionCompiler()
+    restriction = SN(id='R001', domain=(
+        '[["location_id", "in", [item.id for item in previous]]]'))
+
+    domain = compiler(restriction, {'previous': [SN(id='L001')]})
+    other = compiler(restriction, {'previous': [SN(id='L002')]})
+
+    assert domain == [["location_id", "in", ["L001"]]]
+    assert other == [["location_id", "in", ["L002"]]]
+    assert len(compiler.compiled) == 1
+
+
+def test_restriction_compiler_context_untouched():
+    compiler = RestrictionCompiler()
+    context = {'user': {'id': '007'}}
+
+    domain = compiler(SN(id='R001', domain='[["user_id", "=", user["id"]]]'),
+                      context)
+
+    assert domain == [["user_id", "=", "007"]]
+    assert context == {'user': {'id': '007'}}
+
+
+def test_restriction_compiler_version():
+    compiler = RestrictionCompiler()
+
+    first = compiler(SN(id='R001', version=1, domain='[["a", "=", 1]]'), {})
+    cached = compiler(SN(id='R001', version=1, domain='[["a", "=", 2]]'), {})
+    updated = compiler(SN(id='R001', version=2, domain='[["a", "=", 2]]'), {})
+
+    assert first == cached == [["a", "=", 1]]
+    assert updated == [["a", "=", 2]]
+
+
+def test_restriction_compiler_forbidden():
+    compiler = RestrictionCompiler()
+    expression = '().__class__'
+
+    assert compiler(SN(id='R001', domain=expression), {}) == expression
+    assert compiler(SN(id='R002', domain=[["a", "=", 1]]), {}) == [
+        ["a", "=", 1]]
+
+
+def test_restriction_compiler_matches_safe_eval():
+    compiler = RestrictionCompiler(prefix='>>>')
+    safe_eval = SafeEval(prefix='>>>')
+    context = {'user': {'id': '007'}}
+
+    for expression in [
+            '>>> [["user_id", "=", user["id"]]]',
+            '>>> [["total", "=", round(abs(-2.5)) + max(1, 3)]]',
+            '>>> ().__class__', '>>> 2 ** 2',
+            '[["user_id", "=", user["id"]]]']:
+        assert compiler(SN(id=expression, domain=expression),
+                        dict(context)) == safe_eval(expression, dict(context))
+
+
+def test_restriction_compiler_max_entries():
+    compiler = RestrictionCompiler(max_entries=2)
+
+    for id_ in ['R001', 'R002', 'R001', 'R003']:
+        compiler.compile(SN(id=id_, domain='[]'))
+
+    assert list(compiler.compiled) == [('R001', '[]'), ('R003', '[]')]
@@ -1,8 +1,12 @@
 from pytest import fixture
-from graphql import build_schema, graphql
+from graphql import build_schema, graphql, parse
 from integrark.application.services import QueryService
-from integrark.core.common import Solution, IntegrationImporter
+from integrark.core.common import (
+    Solution, IntegrationImporter, SharedCache, Instrumentation,
+    WeightedCache)
 from integrark.core.query import GraphqlQueryService, GraphqlSchemaLoader
+from integrark.core.query.graphql.graphql_query_service import (
+    NODE_SIZE, document_weight)
 
 
 @fixture
@@ -195,3 +199,69 @@ async def test_graphql_query_service_run_path_errors(query_service):
          'locations': [{'line': 6, 'column': 9}],
          'path': ['veterinary']}
     ]
+
+
+async def test_graphql_query_service_run_shared_cache(
+        schema_loader, integration_importer):
+    shared_cache = SharedCache()
+    query_service = GraphqlQueryService(
+        schema_loader, integration_importer, shared_cache)
+
+    context = {'graphql': {'context_value': {}}}
+    graphql_context = context['graphql']['context_value']
+
+    await query_service.run('{ doctors { name } }', context)
+
+    assert graphql_context['shared_cache'] is shared_cache
+
+
+async def test_graphql_query_service_run_instrumentation(
+        schema_loader, integration_importer):
+    instrumentation = Instrumentation()
+    query_service = GraphqlQueryService(
+        schema_loader, integration_importer,
+        instrumentation=instrumentation)
+
+    context = {'graphql': {'context_value': {}}}
+    graphql_context = context['graphql']['context_value']
+
+    await query_service.run('{ doctors { name } }', context)
+
+    assert graphql_context['instrumentation'].parent is instrumentation
+
+
+async def test_graphql_query_service_run_document_cache(query_service):
+    query = '{ doctors { name } }'
+
+    first = await query_service.run(query)
+    second = await query_service.run(query)
+    invalid = await query_service.run('{ doctors { address } }')
+    syntax = await query_service.run('{ doctors {')
+
+    assert first.data == second.data
+    assert invalid.errors and syntax.errors
+    assert len(query_service.documents) == 1
+    assert query_service.documents.stats['hits'] == 1
+    assert query_service.documents.stats['misses'] == 3
+
+
+async def test_graphql_query_service_document_cache_bounded(
+        schema_loader, integration_importer):
+    query_service = GraphqlQueryService(
+        schema_loader, integration_importer,
+        documents=WeightedCache(max_weight=10000, weigh=document_weight))
+
+    for field in ['name', 'specialty', 'age']:
+        result = await query_service.run(f'{{ doctors {{ {field} }} }}')
+        assert result.errors is None
+
+    assert query_service.documents.weight <= 10000
+    assert len(query_service.documents) == 2
+
+
+def test_graphql_query_service_document_weight():
+    small = parse('{ doctors { name } }')
+    large = parse('{ doctors { name age specialty } }')
+
+    assert document_weight(small) == 8 * NODE_SIZE
+    assert document_weight(large) == 12 * NODE_SIZE
@@ -0,0 +1,48 @@
+from graphql import build_schema, graphql
+from integrark.core import selected_fields
+
+
+async def test_selected_fields():
+    schema = build_schema("""
+    type Person {
+        firstName: String
+        lastName: String
+        birthDate: String
+        friends: [Person]
+    }
+
+    type Query {
+        person: Person
+    }
+    """)
+
+    selections = []
+
+    async def resolve_person(parent, info):
+        selections.append(selected_fields(info))
+        selections.append(selected_fields(info, snake=False))
+        return {}
+
+    schema.query_type.fields['person'].resolve = resolve_person
+
+    result = await graphql(schema, """
+    {
+        person {
+            __typename
+            firstName
+            ... on Person { lastName }
+            ...dates
+            friends { firstName }
+        }
+    }
+
+    fragment dates on Person {
+        birthDate
+        firstName
+    }
+    """)
+
+    assert result.errors is None
+    assert selections == [
+        ['first_name', 'last_name', 'birth_date', 'friends'],
+        ['firstName', 'lastName', 'birthDate', 'friends']]
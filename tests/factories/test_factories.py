@@ -11,6 +11,8 @@ test_tuples = [
         ('ExecutionManager', 'ExecutionManager'),
         ('RoutingManager', 'RoutingManager'),
         ('JwtSupplier', 'JwtSupplier'),
+        ('SharedCache', 'SharedCache'),
+        ('Instrumentation', 'Instrumentation'),
         ('IntegrationImporter', 'IntegrationImporter'),
     ]),
     ('GraphqlFactory', [
@@ -31,3 +33,26 @@ def test_factories():
         for abstract, concrete in dependencies:
             result = injector.resolve(abstract)
             assert type(result).__name__ == concrete
+
+
+def test_base_factory_memcached_loads():
+    custom_config = {**config, 'cache': {
+        'ttl': 60, 'memcached': 'localhost:11211',
+        'loads': 'json.loads'}}
+    factory = factory_builder.build(custom_config, name='BaseFactory')
+
+    shared_cache = Injectark(factory=factory).resolve('SharedCache')
+
+    assert type(shared_cache).__name__ == 'MemcachedCache'
+    assert shared_cache.loads('{"id": "1"}') == {'id': '1'}
+    assert shared_cache.ttl == 60
+
+
+def test_base_factory_shared_cache_max_entries():
+    custom_config = {**config, 'cache': {'ttl': 60, 'max_entries': 50}}
+    factory = factory_builder.build(custom_config, name='BaseFactory')
+
+    shared_cache = Injectark(factory=factory).resolve('SharedCache')
+
+    assert type(shared_cache).__name__ == 'SharedCache'
+    assert shared_cache.max_entries == 50
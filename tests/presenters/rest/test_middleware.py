@@ -1,6 +1,6 @@
 from pytest import fixture
 from integrark.presenters.rest.middleware import (
-    user_middleware_factory, errors_middleware_factory)
+    user_middleware_factory, errors_middleware_factory, public)
 from integrark.core import JwtSupplier
 from integrark.presenters.rest import middleware
 
@@ -93,6 +93,70 @@ async def test_user_middleware_authorization_token_user(headers):
         'roles': []
     }
 
+
+async def test_user_middleware_cached_user(headers):
+    users = []
+
+    class MockRequest(dict):
+        def __init__(self):
+            self.headers = headers
+
+    async def handler(request):
+        users.append(request['user'])
+
+    class MockInjector(dict):
+        def __init__(self):
+            self['JwtSupplier'] = JwtSupplier('INTEGRARK_SECRET')
+
+    user_middleware = user_middleware_factory(MockInjector())
+
+    await user_middleware(MockRequest(), handler)
+    await user_middleware(MockRequest(), handler)
+
+    users[0]['roles'].append('admin|x')
+    users[0]['name'] = 'Mallory'
+
+    await user_middleware(MockRequest(), handler)
+
+    assert users[1]['name'] == users[2]['name'] == 'John Doe'
+    assert users[1]['roles'] == users[2]['roles'] == []
+
+
+async def test_user_middleware_lazy_user(headers):
+    decoded = []
+
+    class MockJwtSupplier(JwtSupplier):
+        def decode(self, token, *args, **kwargs):
+            decoded.append(token)
+            return super().decode(token, *args, **kwargs)
+
+    class MockRequest(dict):
+        def __init__(self):
+            self.headers = headers
+
+    class MockInjector(dict):
+        def __init__(self):
+            self['JwtSupplier'] = MockJwtSupplier('INTEGRARK_SECRET')
+
+    async def handler(request):
+        return request['user']
+
+    @public
+    async def public_handler(request):
+        return request['user']
+
+    user_middleware = user_middleware_factory(MockInjector())
+
+    user = await user_middleware(MockRequest(), handler)
+    assert decoded == []
+    assert user['uid'] == '001'
+    assert len(decoded) == 1
+
+    user = await user_middleware(MockRequest(), public_handler)
+    assert user['name'] == '<<PUBLIC>>'
+    assert len(decoded) == 1
+
+
 async def test_error_middleware(headers, monkeypatch):
     class MockRequest(dict):
         def __init__(self):
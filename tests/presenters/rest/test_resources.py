@@ -0,0 +1,53 @@
+import json
+from integrark.presenters.rest.middleware import LazyUser
+from integrark.presenters.rest.resources.graphql import GraphqlResource
+from integrark.presenters.rest.resources.rest import RestResource
+
+
+class MockRequest(dict):
+    def __init__(self):
+        self.app = {'client': None}
+        self.method = 'GET'
+        self.url = 'http://integrark/rest/location/path'
+        self.path = '/rest/location/path'
+        self.path_qs = '/rest/location/path'
+        self.match_info = {'location': 'location'}
+        self['user'] = LazyUser(lambda: {'uid': '001', 'roles': []})
+
+    async def json(self):
+        return {'query': '{}'}
+
+
+class MockManager:
+    def __init__(self):
+        self.contexts = []
+
+    async def execute(self, query, context):
+        self.contexts.append(context['graphql']['context_value'])
+        return {}
+
+    async def route(self, location, context):
+        self.contexts.append(context)
+        return b''
+
+
+async def test_graphql_resource_plain_user():
+    manager = MockManager()
+    resource = GraphqlResource({'ExecutionManager': manager})
+
+    await resource.post(MockRequest())
+
+    user = manager.contexts[0]['user']
+    assert type(user) is dict
+    assert json.loads(json.dumps(user)) == {'uid': '001', 'roles': []}
+
+
+async def test_rest_resource_plain_user():
+    manager = MockManager()
+    resource = RestResource({'RoutingManager': manager})
+
+    await resource.route(MockRequest())
+
+    user = manager.contexts[0]['user']
+    assert type(user) is dict
+    assert user.copy() == {'uid': '001', 'roles': []}